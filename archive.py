@@ -0,0 +1,94 @@
+"""Archiving of old RESOLVED grievances out of the live GRIEVANCE tab.
+
+Every GRIEVANCE refresh, delta sync and ``find`` covers the whole tab, and
+most of it is years of RESOLVED rows that never change again. ``archive()``
+moves RESOLVED rows resolved more than ``ARCHIVE_AFTER_DAYS`` ago into
+``GRIEVANCE_ARCHIVE_<YYYY>`` tabs, by the year the grievance was filed:
+
+1. queued GRIEVANCE writes are flushed first (they address rows by
+   position); the run is refused if any are left;
+2. rows are appended to their year's tab, skipping REFERENCE_NOs already
+   there, so a run interrupted after this step can simply be repeated;
+3. holding GRIEVANCE's rows lock exclusively, so no worker process writes
+   by row number meanwhile, the key column is re-read to check no rows
+   moved, and the archived rows are deleted in one batch request.
+
+The mirror (status check, RESOLVED/ALL filters) and the summary (scorecards)
+union the archive tabs back in. Other worker processes see the deletion on
+their next delta sync and reload, archive included. Until then their
+snapshots hold old row numbers; ``write_fields`` reads each target row's
+REFERENCE_NO back before writing and looks up rows that moved.
+
+    python archive.py --days 365 [--dry-run]
+"""
+import argparse
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytz
+
+from db import ARCHIVE_PREFIX, INDEXED, as_datetime, frame_from_values, get_store, typed_frame
+from writer import get_writer
+
+TAB = "GRIEVANCE"
+ARCHIVE_AFTER_DAYS = int(os.environ.get("GMS_ARCHIVE_AFTER_DAYS", 365))
+
+
+def archive(store, writer, days=ARCHIVE_AFTER_DAYS, dry_run=False):
+    """Move RESOLVED grievances resolved over ``days`` ago to their year tab; returns ``{tab: rows}``."""
+    while writer.flush():
+        pass
+    if writer.pending(TAB):
+        raise RuntimeError("GRIEVANCE has queued writes that could not be flushed yet; try again later.")
+    values = store.call(TAB, "get_all_values")
+    if len(values) < 2:
+        return {}
+    header, key = values[0], values[0].index(INDEXED[TAB])
+    frame = typed_frame(TAB, frame_from_values(values))
+    now = datetime.now(pytz.timezone("Asia/Kolkata")).replace(tzinfo=None)
+    filed = as_datetime(frame["DATE_TIME"])
+    resolved_at = as_datetime(frame["RESOLVE_DATE"]).fillna(filed)
+    year = filed.dt.year.fillna(resolved_at.dt.year)
+    old = (frame["STATUS"] == "RESOLVED") & (resolved_at < now - pd.Timedelta(days=days)) & year.notna()
+    by_tab = {}
+    for pos in old.to_numpy().nonzero()[0]:
+        by_tab.setdefault(f"{ARCHIVE_PREFIX}{int(year.iat[pos])}", []).append(int(pos))
+    if dry_run or not by_tab:
+        return {tab: len(rows) for tab, rows in sorted(by_tab.items())}
+
+    width = len(header)
+    for tab, rows in sorted(by_tab.items()):
+        store.add_tab(tab, header)
+        present = set(store.call(tab, "col_values", key + 1))
+        new = [values[pos + 1][:width] + [""] * (width - len(values[pos + 1]))
+               for pos in rows if values[pos + 1][key] not in present]
+        if new:
+            store.call(tab, "append_rows", new)
+        store.invalidate(tab)
+
+    positions = [pos for rows in by_tab.values() for pos in rows]
+    with store.hold_rows(TAB, exclusive=True) as held:
+        if not held:
+            raise RuntimeError("GRIEVANCE writes kept the rows busy; nothing was deleted. Run it again.")
+        keys = store.call(TAB, "col_values", key + 1)
+        if any(pos + 1 >= len(keys) or keys[pos + 1] != values[pos + 1][key] for pos in positions):
+            raise RuntimeError("GRIEVANCE rows moved while archiving; nothing was deleted. Run it again.")
+        store.delete_rows(TAB, [pos + 2 for pos in positions])
+    return {tab: len(rows) for tab, rows in sorted(by_tab.items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move old RESOLVED grievances into per-year archive tabs.")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="archive rows resolved longer ago than this")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would move")
+    args = parser.parse_args()
+    moved = archive(get_store(), get_writer(), days=args.days, dry_run=args.dry_run)
+    for tab, n in moved.items():
+        print(f"{tab}: {n} row(s){' (dry run)' if args.dry_run else ''}")
+    if not moved:
+        print("Nothing to archive.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Offline page benchmarks: runs landing_page.py under Streamlit's AppTest
+against the in-process fake gspread backend (benchmarks/fake_gspread.py).
+
+For each synthetic GRIEVANCE size and each page it reports:
+
+* cold ms  -- first run after clearing st.cache_resource and the shared
+              snapshots on disk (fresh process state, nothing to adopt)
+* warm ms  -- the same interaction again with caches populated
+* calls    -- Sheets API calls made during the cold + warm runs
+* KB       -- JSON-encoded bytes moved through those calls
+* peak MB  -- tracemalloc peak during a separate cold run
+
+Usage (from the repo root):
+
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --rows 1000 10000 --latency 0.05 --pages admin_dashboard status_check
+    python benchmarks/bench_pages.py --json bench.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("GMS_DATA_DIR", tempfile.mkdtemp(prefix="gms-bench-"))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import db  # noqa: E402
+from fake_gspread import FakeBackend, dataset  # noqa: E402
+
+APP = os.path.join(ROOT, "landing_page.py")
+PAGES = ["landing", "new_form", "status_check", "login", "admin_dashboard", "officer_dashboard"]
+ADMIN = {"HRMS_ID": "ADM001", "NAME": "Admin User", "RANK": "CWM", "ROLE": "ADMIN", "LOGIN_KEY": "admin"}
+
+
+def _app(page, **state):
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.secrets["gcp_service_account"] = {"type": "service_account"}
+    at.session_state["page"] = page
+    for key, value in state.items():
+        at.session_state[key] = value
+    return at
+
+
+def _run(runnable):
+    """``runnable.run()``, failing the benchmark if the page raised."""
+    at = runnable.run()
+    if at.exception:
+        raise RuntimeError("page raised: " + "; ".join(e.message for e in at.exception))
+    return at
+
+
+def _busiest(tabs, column):
+    header = tabs["GRIEVANCE"][0]
+    values = [row[header.index(column)] for row in tabs["GRIEVANCE"][1:]]
+    return max(set(values) - {"N/A"}, key=values.count)
+
+
+def scenarios(tabs):
+    """``page -> callable`` that performs the page's main interaction."""
+    employee = _busiest(tabs, "HRMS_ID")
+    officer_name = _busiest(tabs, "MARKED_OFFICER")
+    officer = next(dict(zip(tabs["OFFICER_MAPPING"][0], row)) for row in tabs["OFFICER_MAPPING"][1:]
+                   if f"{row[1]} ({row[2]})" == officer_name)
+
+    def landing():
+        _run(_app("landing"))
+
+    def new_form():
+        at = _run(_app("new_form"))
+        at.text_input[0].input(employee)
+        _run(at.button[0].click())  # verify, then the form renders with its dropdowns
+
+    def status_check():
+        at = _run(_app("status_check"))
+        at.text_input[0].input(employee)
+        _run(at.button[0].click())
+
+    def login():
+        at = _run(_app("login"))
+        at.text_input[0].input("ADM001")
+        _run(at.button[0].click())
+
+    def admin_dashboard():
+        _run(_app("admin_dashboard", active_super=ADMIN, super_verified=True))
+
+    def officer_dashboard():
+        _run(_app("officer_dashboard", active_super=officer, super_verified=True))
+
+    return {name: fn for name, fn in locals().items() if name in PAGES}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def _cold():
+    """Forget everything a previous run cached, in memory and in the shared snapshots on disk."""
+    st.cache_resource.clear()
+    shutil.rmtree(db.SHARED_DIR, ignore_errors=True)
+
+
+def bench(rows, pages, latency):
+    tabs = dataset(rows)
+    backend = FakeBackend(tabs, latency=latency)
+    db.authorize = backend.authorize
+    runs = scenarios(tabs)
+    results = []
+    for page in pages:
+        _cold()
+        backend.reset_stats()
+        cold = _timed(runs[page])
+        warm = _timed(runs[page])
+        calls, nbytes = sum(backend.calls.values()), backend.bytes
+
+        _cold()
+        tracemalloc.start()
+        runs[page]()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append({
+            "rows": rows, "page": page, "cold_ms": round(cold, 1), "warm_ms": round(warm, 1),
+            "calls": calls, "kb": round(nbytes / 1024, 1), "peak_mb": round(peak / 2 ** 20, 1),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per Sheets call")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    results = []
+    print(f"{'rows':>7}  {'page':<18} {'cold ms':>9} {'warm ms':>9} {'calls':>6} {'KB':>9} {'peak MB':>8}")
+    for rows in args.rows:
+        for r in bench(rows, args.pages, args.latency):
+            results.append(r)
+            print(f"{r['rows']:>7}  {r['page']:<18} {r['cold_ms']:>9} {r['warm_ms']:>9} {r['calls']:>6} "
+                  f"{r['kb']:>9} {r['peak_mb']:>8}", flush=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Start-up benchmark: cold start and rerun cost of the landing page.
+
+* cold ms   -- a fresh interpreter executing landing_page.py once (Streamlit
+               bare mode), i.e. imports plus the first script run
+* heavy     -- which of pandas, gspread, google-auth and DuckDB that loaded
+* rerun ms  -- mean of ``--reruns`` further runs of the landing page under
+               AppTest in one process. AppTest compiles the entry script
+               afresh on every run, which a live server does only once, so
+               this includes that compile.
+
+Usage (from the repo root):
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --cold 10 --reruns 50
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "landing_page.py")
+HEAVY = ("pandas", "gspread", "google.auth", "duckdb")
+
+CHILD = f"""
+import logging, runpy, sys, time
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+runpy.run_path({APP!r}, run_name="__main__")
+print(time.perf_counter() - start, ",".join(m for m in {HEAVY!r} if m in sys.modules) or "-")
+"""
+
+
+def cold(runs):
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, capture_output=True, text=True, check=True)
+        seconds, heavy = out.stdout.split()[-2:]
+        times.append(float(seconds) * 1000)
+    return statistics.median(times), heavy
+
+
+def reruns(runs):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    start = time.perf_counter()
+    for _ in range(runs):
+        at.run()
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cold", type=int, default=5, help="fresh interpreters to time (median reported)")
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    cold_ms, heavy = cold(args.cold)
+    print(f"{'cold ms':>9} {'rerun ms':>9}  heavy modules loaded")
+    print(f"{cold_ms:>9.1f} {reruns(args.reruns):>9.1f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""In-process stand-in for gspread's Client / Spreadsheet / Worksheet.
+
+Implements the subset the app uses, keeps every tab as a list of string
+rows, sleeps ``latency`` seconds per API call and records each call as
+``(tab, op, bytes)`` so benchmarks can report Sheets traffic without network.
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+from gspread.cell import Cell
+from gspread.utils import a1_range_to_grid_range
+
+GRIEVANCE_HEADER = [
+    "REFERENCE_NO", "DATE_TIME", "HRMS_ID", "EMP_NAME", "EMP_NO", "SECTION", "DESIGNATION", "TRADE",
+    "GRIEVANCE_TYPE", "GRIEVANCE_TEXT", "STATUS", "MARKED_OFFICER", "ASSIGN_DATE", "OFFICER_REMARK", "RESOLVE_DATE",
+]
+SECTIONS = ["Body Shop", "Bogie Shop", "Paint Shop", "Machine Shop", "Store", "Wheel Shop", "Electrical", "Admin"]
+DESIGNATIONS = ["Technician-I", "Technician-II", "Technician-III", "Helper", "JE", "SSE", "Clerk"]
+TRADES = ["Fitter", "Welder", "Electrician", "Machinist", "Painter", "Carpenter"]
+G_TYPES = ["Salary", "Leave", "Quarter", "Overtime", "Promotion", "Medical", "Transfer", "Other"]
+WORDS = ["salary", "not", "credited", "quarter", "repair", "overtime", "pending", "leave", "sanction",
+         "medical", "bill", "promotion", "delay", "वेतन", "छुट्टी", "आवास", "मरम्मत", "बकाया"]
+
+
+def _cost(value):
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode())
+
+
+class FakeWorksheet:
+    def __init__(self, backend, title, rows):
+        self._backend = backend
+        self.title = title
+        self.rows = [[str(v) for v in row] for row in rows]
+
+    @property
+    def id(self):
+        return abs(hash(self.title)) % 10 ** 9
+
+    def _call(self, op, payload):
+        self._backend.record(self.title, op, _cost(payload))
+        return payload
+
+    def _grid(self, a1):
+        grid = a1_range_to_grid_range(a1.split("!")[-1])
+        r0, c0 = grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0)
+        r1, c1 = grid.get("endRowIndex", len(self.rows)), grid.get("endColumnIndex", len(self.rows[0]) if self.rows else 0)
+        return r0, c0, r1, c1
+
+    def _read(self, a1, major_dimension=None):
+        r0, c0, r1, c1 = self._grid(a1)
+        block = [row[c0:c1] + [""] * (c1 - c0 - len(row[c0:c1])) for row in self.rows[r0:r1]]
+        if major_dimension == "COLUMNS":
+            block = [list(col) for col in zip(*block)]
+        out = []
+        for cells in block:
+            while cells and cells[-1] == "":
+                cells = cells[:-1]
+            out.append(cells)
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def _set(self, row, col, value):
+        while len(self.rows) < row:
+            self.rows.append([""] * len(self.rows[0]))
+        cells = self.rows[row - 1]
+        cells.extend([""] * (col - len(cells)))
+        cells[col - 1] = str(value)
+
+    # --- reads ---
+    def get_all_values(self, **kwargs):
+        return self._call("get_all_values", [list(row) for row in self.rows])
+
+    def get_all_records(self, **kwargs):
+        header = self.rows[0] if self.rows else []
+        return self._call("get_all_records", [dict(zip(header, row)) for row in self.rows[1:]])
+
+    def row_values(self, row, **kwargs):
+        return self._call("row_values", list(self.rows[row - 1]) if row <= len(self.rows) else [])
+
+    def col_values(self, col, **kwargs):
+        return self._call("col_values", [row[col - 1] if len(row) >= col else "" for row in self.rows])
+
+    def batch_get(self, ranges, major_dimension=None, **kwargs):
+        return self._call("batch_get", [self._read(a1, major_dimension) for a1 in ranges])
+
+    def find(self, query, in_row=None, in_column=None, **kwargs):
+        self._backend.record(self.title, "find", _cost(query))
+        for r, row in enumerate(self.rows, start=1):
+            if in_row is not None and r != in_row:
+                continue
+            for c, value in enumerate(row, start=1):
+                if (in_column is None or c == in_column) and value == str(query):
+                    return Cell(r, c, value)
+        return None
+
+    # --- writes ---
+    def append_row(self, values, **kwargs):
+        return self.append_rows([values], **kwargs)
+
+    def append_rows(self, values, **kwargs):
+        self._backend.record(self.title, "append_rows", _cost(values))
+        start = len(self.rows) + 1
+        self.rows.extend([str(v) for v in row] for row in values)
+        return {"updates": {"updatedRange": f"'{self.title}'!A{start}:A{len(self.rows)}", "updatedRows": len(values)}}
+
+    def update_cell(self, row, col, value):
+        self._backend.record(self.title, "update_cell", _cost(value))
+        self._set(row, col, value)
+
+    def batch_update(self, data, **kwargs):
+        self._backend.record(self.title, "batch_update", _cost(list(data)))
+        for item in data:
+            r0, c0, _, _ = self._grid(item["range"])
+            for i, values in enumerate(item["values"]):
+                for j, value in enumerate(values):
+                    self._set(r0 + i + 1, c0 + j + 1, value)
+        return {}
+
+    def delete_rows(self, start_index, end_index=None):
+        self._backend.record(self.title, "delete_rows", 0)
+        del self.rows[start_index - 1:(end_index or start_index)]
+
+
+class FakeSpreadsheet:
+    def __init__(self, backend, tabs):
+        self._backend = backend
+        self.tabs = {title: FakeWorksheet(backend, title, rows) for title, rows in tabs.items()}
+
+    def worksheets(self, **kwargs):
+        self._backend.record(None, "worksheets", 0)
+        return list(self.tabs.values())
+
+    def worksheet(self, title):
+        return self.tabs[title]
+
+    def batch_update(self, body):
+        self._backend.record(None, "batch_update", _cost(body))
+        by_id = {ws.id: ws for ws in self.tabs.values()}
+        for request in body["requests"]:
+            grid = request["deleteDimension"]["range"]
+            del by_id[grid["sheetId"]].rows[grid["startIndex"]:grid["endIndex"]]
+        return {}
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        self._backend.record(None, "add_worksheet", 0)
+        self.tabs[title] = FakeWorksheet(self._backend, title, [])
+        return self.tabs[title]
+
+
+class FakeClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open(self, title):
+        self.spreadsheet._backend.record(None, "open", 0)
+        return self.spreadsheet
+
+
+class FakeCredentials:
+    expiry = None
+
+    def refresh(self, request):
+        pass
+
+
+class FakeBackend:
+    """Holds the fake spreadsheet plus call accounting; ``authorize`` replaces ``db.authorize``."""
+
+    def __init__(self, tabs, latency=0.0):
+        self.latency = latency
+        self.spreadsheet = FakeSpreadsheet(self, tabs)
+        self.client = FakeClient(self.spreadsheet)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def authorize(self, creds_info):
+        return FakeCredentials(), self.client
+
+    def record(self, tab, op, nbytes):
+        with self._lock:
+            self.calls[(tab, op)] += 1
+            self.bytes += nbytes
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = Counter()
+            self.bytes = 0
+
+
+# ==========================================
+# SYNTHETIC DATA
+# ==========================================
+def officer_rows(n_officers=20):
+    rows = [["HRMS_ID", "NAME", "RANK", "ROLE", "LOGIN_KEY"], ["ADM001", "Admin User", "CWM", "ADMIN", "admin"]]
+    for i in range(n_officers):
+        rows.append([f"OFF{i:03d}", f"Officer {i}", random.choice(["SSE", "AWM", "DYCME"]), "OFFICER", f"key{i}"])
+    rows.append(["BTH001", "Both User", "WM", "BOTH", "both"])
+    return rows
+
+
+def dataset(n_grievances, n_employees=None, n_officers=20, seed=7):
+    """All four tabs, with ``n_grievances`` GRIEVANCE rows spread over a few years."""
+    random.seed(seed)
+    n_employees = n_employees or max(100, n_grievances // 3)
+    employees = [f"E{i:05d}" for i in range(n_employees)]
+    officers = officer_rows(n_officers)
+    officer_names = [f"{r[1]} ({r[2]})" for r in officers[1:] if r[3] in ("OFFICER", "BOTH")]
+    grievances = [GRIEVANCE_HEADER]
+    seq = Counter()
+    for i in range(n_grievances):
+        day = 1 + (i * 1500) // max(n_grievances, 1)  # spread over ~4 years
+        ts = time.gmtime(1609459200 + day * 86400 + random.randint(0, 36000))
+        date, stamp = time.strftime("%Y%m%d", ts), time.strftime("%d-%m-%Y %H:%M", ts)
+        hrms = random.choice(employees)
+        seq[(hrms, date)] += 1
+        status = random.choices(["NEW", "UNDER PROCESS", "RESOLVED"], [1, 2, 7])[0] if i < n_grievances * 0.9 else \
+            random.choice(["NEW", "UNDER PROCESS"])
+        officer = random.choice(officer_names) if status != "NEW" else "N/A"
+        text = " ".join(random.choices(WORDS, k=random.randint(6, 30)))
+        grievances.append([
+            f"{date}{hrms}{seq[(hrms, date)]:03d}", stamp, hrms, f"Employee {hrms}", str(10000 + i),
+            random.choice(SECTIONS), random.choice(DESIGNATIONS), random.choice(TRADES), random.choice(G_TYPES), text,
+            status, officer, stamp if status != "NEW" else "N/A",
+            "Resolved after review" if status == "RESOLVED" else "N/A", stamp if status == "RESOLVED" else "N/A",
+        ])
+    dropdowns = [["DESIGNATION_LIST", "TRADE_LIST", "GRIEVANCE_TYPE_LIST"]]
+    for i in range(max(len(DESIGNATIONS), len(TRADES), len(G_TYPES))):
+        pick = lambda values: values[i] if i < len(values) else ""
+        dropdowns.append([pick(DESIGNATIONS), pick(TRADES), pick(G_TYPES)])
+    return {
+        "GRIEVANCE": grievances,
+        "EMPLOYEE_MAPPING": [["HRMS_ID", "EMPLOYEE_NAME"]] + [[e, f"Employee {e}"] for e in employees],
+        "OFFICER_MAPPING": officers,
+        "DROPDOWN_MAPPINGS": dropdowns,
+    }
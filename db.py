@@ -0,0 +1,1030 @@
+"""Shared Google Sheets data-access layer for the GMS app.
+
+Streamlit re-runs ``landing_page.py`` on every interaction, so anything built
+at page level is rebuilt per click. ``get_store()`` hands out one
+``SheetStore`` per process instead: a single authorized gspread client and
+one ``Worksheet`` handle per tab, shared by every session.
+
+On top of the handles sits a read-through snapshot cache: each tab is held as
+a DataFrame for ``TTL[tab]`` seconds, and the app's own writes patch the
+cached frame so users see their change on the very next rerun.
+Snapshots are shared across sessions; treat them as read-only.
+
+Tabs listed in ``INDEXED`` also get a dict index on their key column, so
+"verify HRMS ID" is a hash lookup rather than a DataFrame scan, and a
+REFERENCE_NO resolves to its sheet row without a server-side ``find``.
+
+Append-mostly tabs (``MUTABLE``) are refreshed by delta sync rather than a
+full download: one ``batch_get`` reads the key column and the mutable
+columns of the rows we already hold, plus whatever was appended past them.
+Only rows that actually changed are patched into the snapshot.
+
+Tabs in ``PROJECTED`` are only ever read for a few columns; their snapshots
+hold just those, fetched as column arrays with one ``batch_get``.
+
+GRIEVANCE is held typed (``SCHEMA``): enum-like columns as categoricals,
+the date columns as ``datetime64[s]``, free text as Arrow-backed strings.
+``cell_text`` turns a cell back into what the sheet shows.
+
+Old RESOLVED grievances are moved out of GRIEVANCE into per-year
+``GRIEVANCE_ARCHIVE_<YYYY>`` tabs (archive.py). Those tabs share GRIEVANCE's
+schema, never change once written, and are cached for ``ARCHIVE_TTL``.
+
+Refreshes are single-flight per tab: when a snapshot goes stale under load,
+one caller refetches it and the others keep reading the stale snapshot
+until it is done, rather than issue the same read or queue behind it (it
+may be a background refresh waiting for quota). Only a caller with no
+snapshot at all waits, up to ``FLIGHT_WAIT``. Every call is metered by the
+token bucket in quota.py. If a refresh fails (429, quota wait exhausted,
+transport error), readers get the last good snapshot and the refetch is
+retried after ``STALE_RETRY`` seconds.
+
+Refreshes are also single-flight across the app processes on one machine
+(shared.py): the process elected for a refresh publishes the result as a
+versioned, memory-mapped file, and the others adopt that version instead of
+reading Sheets themselves. Only what was read from Sheets is published; each
+process lays its own queued writes over the version it adopts.
+"""
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+import gspread
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+from google.auth.exceptions import RefreshError, TransportError
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+from gspread.utils import rowcol_to_a1
+
+import shared
+from metrics import METRICS
+from quota import WRITE, QuotaExceeded, TokenBucket, current_priority
+
+# ==========================================
+# 0. CONFIG
+# ==========================================
+SPREADSHEET_NAME = "Grievance_DB"
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+TABS = ("GRIEVANCE", "EMPLOYEE_MAPPING", "OFFICER_MAPPING", "DROPDOWN_MAPPINGS")
+
+# Local state that must survive reruns (sequence counters, journals, ...).
+DATA_DIR = os.environ.get("GMS_DATA_DIR", ".gms_data")
+
+# Snapshots shared by all app processes on this machine (see shared.py);
+# GMS_SHARE_SNAPSHOTS=0 makes every process refresh on its own again.
+SHARED_DIR = os.path.join(DATA_DIR, "snapshots")
+SHARE_SNAPSHOTS = os.environ.get("GMS_SHARE_SNAPSHOTS", "1") != "0" and shared.available()
+
+# Snapshot lifetime per tab (seconds). Mapping tabs are edited by hand and
+# rarely; GRIEVANCE changes with every submission from other workers.
+TTL = {"GRIEVANCE": 10, "EMPLOYEE_MAPPING": 600, "OFFICER_MAPPING": 300, "DROPDOWN_MAPPINGS": 600}
+DEFAULT_TTL = 60
+
+# Per-year tabs holding archived RESOLVED grievances (see archive.py).
+ARCHIVE_PREFIX = "GRIEVANCE_ARCHIVE_"
+ARCHIVE_TTL = 3600  # archive tabs only grow when the archiver runs; also how often tabs are re-listed
+
+# Archiving deletes rows, which shifts every row below. Writers hold a tab's
+# rows lock shared while they address rows by number, the archiver holds it
+# exclusively while it deletes (``hold_rows``).
+ROWS_WAIT = 60
+
+# Append-mostly tabs: new rows only go on the end and, after that, only these
+# columns change. They are delta-synced, with a full reload every
+# FULL_SYNC_EVERY seconds to pick up hand edits elsewhere in the sheet.
+MUTABLE = {"GRIEVANCE": ("STATUS", "MARKED_OFFICER", "ASSIGN_DATE", "OFFICER_REMARK", "RESOLVE_DATE")}
+FULL_SYNC_EVERY = 600
+
+# Column dtypes of typed snapshots; other columns stay Arrow-backed strings.
+# Dates are parsed from DATE_FORMAT; blank or "N/A" cells become NaT and read
+# back as MISSING_DATE. A date column with any other cell that doesn't parse
+# (typed by hand, legacy formats) is kept as the sheet's text instead, so
+# nothing is lost; ``as_datetime`` reads either kind.
+SCHEMA = {
+    "GRIEVANCE": {
+        "category": ("STATUS", "GRIEVANCE_TYPE", "DESIGNATION", "TRADE", "SECTION", "MARKED_OFFICER"),
+        "datetime": ("DATE_TIME", "ASSIGN_DATE", "RESOLVE_DATE"),
+    },
+}
+DATE_FORMAT = "%d-%m-%Y %H:%M"
+MISSING_DATE = "N/A"
+BLANK_DATES = ("", MISSING_DATE)
+
+# Tabs that get a hash index, and the column it is keyed on.
+INDEXED = {"GRIEVANCE": "REFERENCE_NO", "EMPLOYEE_MAPPING": "HRMS_ID", "OFFICER_MAPPING": "HRMS_ID"}
+
+# Tabs the app reads only some columns of; their snapshots hold just these.
+PROJECTED = {
+    "EMPLOYEE_MAPPING": ("HRMS_ID", "EMPLOYEE_NAME"),
+    "DROPDOWN_MAPPINGS": ("DESIGNATION_LIST", "TRADE_LIST", "GRIEVANCE_TYPE_LIST"),
+}
+
+TOKEN_CHECK_EVERY = 60       # seconds between background token checks
+TOKEN_REFRESH_MARGIN = 300   # refresh when the token has less than this left
+
+# Errors after which the client/handles are thrown away and rebuilt.
+RECONNECT_ERRORS = (RefreshError, TransportError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+# Refresh failures after which readers are served the last good snapshot,
+# and how long they keep getting it before the next refetch attempt.
+DEGRADE_ERRORS = (gspread.exceptions.APIError, QuotaExceeded) + RECONNECT_ERRORS
+STALE_RETRY = 15
+
+# How long a reader with no snapshot at all waits for someone else's refresh.
+FLIGHT_WAIT = 60
+
+# Worksheet methods that change the sheet; they always run at WRITE priority.
+WRITE_OPS = {"append_row", "append_rows", "update", "update_cell", "batch_update", "delete_rows", "add_worksheet"}
+
+
+def is_archive(name):
+    return name.startswith(ARCHIVE_PREFIX)
+
+
+def ttl(name):
+    return TTL.get(name, ARCHIVE_TTL if is_archive(name) else DEFAULT_TTL)
+
+
+def authorize(creds_info):
+    creds = Credentials.from_service_account_info(creds_info, scopes=SCOPE)
+    return creds, gspread.authorize(creds)
+
+
+# ==========================================
+# 1. STORE
+# ==========================================
+def norm_key(value):
+    return str(value).strip().upper()
+
+
+def col_letter(col):
+    return rowcol_to_a1(1, col)[:-1]
+
+
+def frame_from_values(values):
+    """DataFrame from ``get_all_values``-style rows (header first), all cells as str."""
+    if not values:
+        return pd.DataFrame()
+    header, width = values[0], len(values[0])
+    rows = [list(row[:width]) + [""] * (width - len(row)) for row in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+
+def frame_from_columns(columns):
+    """DataFrame from ``{name: cells}`` column arrays, padding short columns with ""."""
+    n = max((len(cells) for cells in columns.values()), default=0)
+    return pd.DataFrame({name: list(cells) + [""] * (n - len(cells)) for name, cells in columns.items()})
+
+
+def typed_frame(name, frame):
+    """All-str ``frame`` of tab ``name`` converted to the dtypes in ``SCHEMA[name]``."""
+    schema = SCHEMA.get("GRIEVANCE" if is_archive(name) else name)
+    if not schema:
+        return frame
+    categories = {c: "category" for c in schema["category"] if c in frame.columns}
+    frame = frame.astype(categories)
+    dates = {}
+    for c in schema["datetime"]:
+        if c not in frame.columns:
+            continue
+        parsed = pd.to_datetime(frame[c], format=DATE_FORMAT, errors="coerce")
+        unparsed = int((parsed.isna() & ~frame[c].str.strip().isin(BLANK_DATES)).sum())
+        if unparsed:
+            METRICS.inc("gms_unparsed_dates_total", unparsed, tab=name, column=c)
+            continue  # keep the sheet's text rather than turn those cells into NaT
+        dates[c] = parsed.astype("datetime64[s]")
+    return frame.assign(**dates)
+
+
+def date_text(series):
+    """A datetime column as the sheet's text."""
+    return series.dt.strftime(DATE_FORMAT).fillna(MISSING_DATE).astype("str")
+
+
+def as_datetime(series):
+    """A ``SCHEMA`` date column as datetime64[s], whether it is held typed or as text; unparsable text is NaT."""
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        return series
+    return pd.to_datetime(series, format=DATE_FORMAT, errors="coerce").astype("datetime64[s]")
+
+
+def concat_typed(name, frame, extra):
+    """``frame`` with the all-str rows of ``extra`` appended, keeping the column dtypes."""
+    extra = typed_frame(name, extra)
+    for column in frame.columns:
+        dtype = frame[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            new = extra[column].cat.categories.difference(dtype.categories)
+            if len(new):
+                frame = frame.assign(**{column: frame[column].cat.add_categories(new)})
+            extra = extra.assign(**{column: extra[column].astype(frame[column].dtype)})
+        elif pd.api.types.is_datetime64_dtype(dtype) != pd.api.types.is_datetime64_dtype(extra[column].dtype):
+            # One side kept a date column as text: keep both as text.
+            if pd.api.types.is_datetime64_dtype(dtype):
+                frame = frame.assign(**{column: date_text(frame[column])})
+            else:
+                extra = extra.assign(**{column: date_text(extra[column])})
+    return pd.concat([frame, extra], ignore_index=True)
+
+
+def cell_text(value):
+    """A typed snapshot cell as the sheet shows it."""
+    if value is pd.NaT:
+        return MISSING_DATE
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(DATE_FORMAT)
+    return str(value)
+
+
+def set_cell(frame, pos, column, text):
+    """Store sheet text ``text`` in row ``pos`` of ``frame[column]``, in the column's dtype.
+
+    Returns the text the cell now reads back as.
+    """
+    series = frame[column]
+    value = text
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if text not in series.cat.categories:
+            frame[column] = series.cat.add_categories([text])
+    elif pd.api.types.is_datetime64_dtype(series.dtype):
+        value = pd.to_datetime(text, format=DATE_FORMAT, errors="coerce")
+        if value is pd.NaT and text.strip() not in BLANK_DATES:
+            METRICS.inc("gms_unparsed_dates_total", tab="*", column=column)
+            frame[column] = date_text(series)  # keep it as text, like ``typed_frame`` does
+            value = text
+    frame.at[frame.index[pos], column] = value
+    return cell_text(frame.at[frame.index[pos], column])
+
+
+def comparable(series, other):
+    """Values of ``series`` that compare cell-for-cell with those of ``other``, the same column of another frame."""
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        if not pd.api.types.is_datetime64_dtype(other.dtype):
+            return date_text(series).to_numpy(dtype=object)  # ``other`` kept the sheet's text
+        return series.to_numpy().view("int64")  # NaT == NaT here
+    return series.to_numpy(dtype=object)
+
+
+class Snapshot:
+    def __init__(self, frame, lock, sheet=None):
+        self.frame = frame
+        # The tab as read from Sheets, without queued or local writes: what is
+        # published to other processes. ``frame`` itself when they are the same.
+        self.sheet = frame if sheet is None else sheet
+        self.lock = lock  # the owning store's lock; guards frame + changes together
+        self.fetched_at = time.monotonic()
+        self.loaded_at = self.fetched_at
+        self.epoch = 0  # bumped by in-place edits; appends leave it alone
+        self.retry_at = 0.0  # after a failed refresh, served as-is until then
+        self.version = None  # shared version this was adopted or published as
+        self.published = None  # ``sheet`` as of that version; the next publish is diffed against it
+        self.patched_at = 0.0  # wall time of the last local write patched in
+        # Row-level changes applied since the fetch, for consumers that derive
+        # state from the frame: ("append", pos) or
+        # ("update", pos, {column: new value}, {column: old value}).
+        self.changes = []
+
+    def view(self, start=0):
+        """``(frame, changes[start:])``, read consistently with each other."""
+        with self.lock:
+            return self.frame, self.changes[start:]
+
+
+class SnapshotFollower:
+    """Base for state derived from one tab's snapshot (query mirrors, counters, ...).
+
+    Subclasses implement ``_load(frame)`` to rebuild from a whole frame and
+    ``_apply(frame, change)`` to fold in one ``Snapshot.changes`` entry. A new
+    snapshot triggers ``_load``; writes and delta syncs only cost ``_apply``.
+    """
+
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+        self._lock = threading.RLock()
+        self._snap = None
+        self._applied = 0
+
+    def sync(self, fetch=True):
+        """Catch up with the store's snapshot, refetching it first if stale when ``fetch``."""
+        snap = self._store.snapshot(self._name, fetch=fetch)
+        if snap is None:
+            return
+        with self._lock:
+            if snap is not self._snap:
+                frame, changes = snap.view()
+                self._load(frame)
+                self._snap, self._applied = snap, len(changes)
+            else:
+                frame, changes = snap.view(self._applied)
+                for change in changes:
+                    self._apply(frame, change)
+                self._applied += len(changes)
+
+    def ensure(self):
+        """Load on first use or once the store dropped the snapshot; otherwise only pick up changes already in memory."""
+        self.sync(fetch=self._store.snapshot(self._name, fetch=False) is None)
+
+    def _load(self, frame):
+        raise NotImplementedError
+
+    def _apply(self, frame, change):
+        raise NotImplementedError
+
+
+class KeyIndex:
+    """``norm_key(value) -> row position`` for one column of a snapshot.
+
+    Appends only extend the index; a refetch or an edited cell rebuilds it.
+    First occurrence wins, matching the old ``match.iloc[0]`` behaviour.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.snap = None
+        self.epoch = -1
+        self.size = 0
+        self.positions = {}
+
+    def sync(self, snap):
+        frame = snap.frame
+        if snap is not self.snap or snap.epoch != self.epoch or len(frame) < self.size:
+            self.snap, self.epoch, self.size, self.positions = snap, snap.epoch, 0, {}
+        if len(frame) > self.size and self.column in frame.columns:
+            keys = frame[self.column].iloc[self.size:]
+            for pos, key in enumerate(keys, start=self.size):
+                self.positions.setdefault(norm_key(key), pos)
+        self.size = len(frame)
+
+
+class SheetStore:
+    """Process-wide holder of the gspread client and worksheet handles."""
+
+    def __init__(self, creds_info, shared=None):
+        self._creds_info = dict(creds_info)
+        self._shared = shared
+        self._lock = threading.RLock()
+        self._creds = None
+        self._client = None
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._listed_at = 0.0
+        self._snapshots = {}
+        self._indexes = {name: KeyIndex(column) for name, column in INDEXED.items()}
+        self._overlays = {}
+        self._flights = {}  # tab -> lock held by the one thread refreshing it
+        self._headers = {}  # tab -> last header row seen, for projected reads
+        self.limiter = TokenBucket()
+        threading.Thread(target=self._token_loop, name="gms-token-refresh", daemon=True).start()
+
+    # --- CONNECTION ---
+    def _connect(self):
+        with METRICS.timer("gms_sheets_call_seconds", tab="*", op="connect"):
+            self._creds, self._client = authorize(self._creds_info)
+            self._spreadsheet = self._client.open(SPREADSHEET_NAME)
+            # One metadata fetch gives us every tab's handle.
+            self._worksheets = {ws.title: ws for ws in self._spreadsheet.worksheets()}
+            self._listed_at = time.monotonic()
+
+    def reset(self):
+        """Drop the client and handles; the next call reconnects."""
+        with self._lock:
+            self._creds = None
+            self._client = None
+            self._spreadsheet = None
+            self._worksheets = {}
+
+    def worksheet(self, name):
+        """Handle for tab ``name``; ``None`` means the spreadsheet itself."""
+        with self._lock:
+            if self._client is None:
+                self._connect()
+            if name is None:
+                return self._spreadsheet
+            if name not in self._worksheets:
+                raise gspread.WorksheetNotFound(name)
+            return self._worksheets[name]
+
+    def call(self, name, op, *args, **kwargs):
+        """Run ``Worksheet.<op>`` on tab ``name``, reconnecting once on auth/transport errors.
+
+        ``name=None`` runs ``Spreadsheet.<op>`` instead. Each attempt first
+        takes a quota token at the calling thread's priority.
+        """
+        level = WRITE if op in WRITE_OPS else current_priority()
+        label = name or "*"
+        for attempt in (0, 1):
+            ws = self.worksheet(name)
+            self.limiter.acquire(level)
+            try:
+                with METRICS.timer("gms_sheets_call_seconds", tab=label, op=op):
+                    return getattr(ws, op)(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                METRICS.inc("gms_sheets_errors_total", tab=label, op=op, code=e.code)
+                if e.code == 429:
+                    self.limiter.pause()
+                if e.code != 401 or attempt:
+                    raise
+            except RECONNECT_ERRORS:
+                METRICS.inc("gms_sheets_errors_total", tab=label, op=op, code=0)
+                if attempt:
+                    raise
+            METRICS.inc("gms_sheets_retries_total", tab=label, op=op)
+            self.reset()
+
+    def archive_tabs(self):
+        """Names of the ``ARCHIVE_PREFIX`` tabs, oldest year first; re-listed every ``ARCHIVE_TTL``."""
+        self.worksheet(None)
+        if time.monotonic() - self._listed_at > ARCHIVE_TTL:
+            try:
+                listed = {ws.title: ws for ws in self.call(None, "worksheets")}
+            except DEGRADE_ERRORS:
+                listed = None  # keep the tabs we already know about
+            with self._lock:
+                if listed is not None:
+                    self._worksheets = listed
+                self._listed_at = time.monotonic()
+        with self._lock:
+            return sorted(name for name in self._worksheets if is_archive(name))
+
+    def add_tab(self, name, header):
+        """Create tab ``name`` with ``header`` as its first row (no-op if it exists)."""
+        if name in self._worksheets:
+            return
+        ws = self.call(None, "add_worksheet", title=name, rows=1, cols=len(header))
+        with self._lock:
+            self._worksheets[name] = ws
+        self.call(name, "append_rows", [header])
+
+    # --- SNAPSHOT CACHE ---
+    def snapshot(self, name, fetch=True):
+        """The ``Snapshot`` behind ``records(name)``; with ``fetch=False`` the cached one (any age) or None."""
+        snap = self._snapshots.get(name)
+        if not fetch:
+            return snap
+        if self._fresh(name, snap):
+            METRICS.inc("gms_cache_requests_total", tab=name, result="hit")
+            return snap
+        flight = self._flights.setdefault(name, threading.Lock())
+        if not flight.acquire(blocking=False):
+            # Someone is refreshing it already, maybe a background refresh queued
+            # for quota: serve what we have rather than wait behind it.
+            if snap is not None:
+                METRICS.inc("gms_cache_requests_total", tab=name, result="stale")
+                return snap
+            if not flight.acquire(timeout=FLIGHT_WAIT):
+                raise TimeoutError(f"{name} is still being loaded; try again shortly")
+        try:
+            # Whoever held the flight before us may have refreshed it already.
+            snap = self._snapshots.get(name)
+            if self._fresh(name, snap):
+                METRICS.inc("gms_cache_requests_total", tab=name, result="coalesced")
+                return snap
+            if self._shared is None:
+                return self._refresh(name, snap)
+            # Another process may have refreshed it; if not, one process does.
+            snap = self._adopt(name, snap)
+            if self._fresh(name, snap):
+                METRICS.inc("gms_cache_requests_total", tab=name, result="shared")
+                return snap
+            # Like the flight above: only a caller with nothing to serve waits for another process's refresh.
+            with self._shared.lock(name, wait=shared.LOCK_WAIT if snap is None else 0) as elected:
+                if elected:
+                    snap = self._adopt(name, snap)
+                    if self._fresh(name, snap):
+                        METRICS.inc("gms_cache_requests_total", tab=name, result="shared")
+                        return snap
+                elif snap is not None:
+                    METRICS.inc("gms_cache_requests_total", tab=name, result="stale")
+                    return snap  # another process is refreshing it; adopt its result next time
+                snap = self._refresh(name, snap)
+                if elected:
+                    self._publish(name, snap)
+                return snap
+        finally:
+            flight.release()
+
+    def _refresh(self, name, snap):
+        """Refetch ``name`` from Sheets: delta sync of ``snap`` when possible, else a full load."""
+        try:
+            if snap is not None and name in MUTABLE and time.monotonic() - snap.loaded_at < FULL_SYNC_EVERY:
+                synced = self._delta_sync(name, snap)
+                if synced is not None:
+                    METRICS.inc("gms_cache_requests_total", tab=name, result="delta")
+                    self._snapshots[name] = synced
+                    return synced
+            METRICS.inc("gms_cache_requests_total", tab=name, result="miss")
+            sheet = typed_frame(name, self._full_load(name))
+            fresh = Snapshot(self._overlaid(name, sheet), self._lock, sheet=sheet)
+        except DEGRADE_ERRORS:
+            if snap is None:
+                raise
+            METRICS.inc("gms_cache_requests_total", tab=name, result="stale")
+            snap.retry_at = time.monotonic() + STALE_RETRY
+            return snap
+        self._snapshots[name] = fresh
+        return fresh
+
+    # --- SHARING ACROSS PROCESSES (see shared.py) ---
+    def _adopt(self, name, snap):
+        """``snap``, or the snapshot that replaced it, caught up with the newest shared version of ``name``."""
+        latest = self._shared.latest(name)
+        if latest is None or not latest.fetched_at:
+            return snap  # nothing published yet, or expired by ``invalidate``: refetch it
+        now, wall = time.monotonic(), time.time()
+        fetched_at, retry_at = now - max(0.0, wall - latest.fetched_at), now + latest.retry_at - wall
+        if snap is None or snap.version != latest.version:
+            local = snap is not None and snap.frame is not snap.sheet
+            if local and snap.patched_at > latest.fetched_at:
+                pass  # our own writes are newer than that version; the next one will have them
+            elif snap is not None and not local and snap.sheet is snap.published \
+                    and latest.changes is not None and snap.version == latest.base:
+                self._replay(name, snap, latest.changes)
+                snap.version, snap.published = latest.version, snap.sheet
+            else:
+                try:
+                    frame = self._shared.read(name, latest.version)
+                except OSError:
+                    return snap  # superseded and removed meanwhile; the next read sees the newer one
+                fresh = Snapshot(self._overlaid(name, frame), self._lock, sheet=frame)
+                fresh.version, fresh.published, fresh.fetched_at = latest.version, frame, fetched_at
+                if name == "GRIEVANCE" and snap is not None and self._rows_moved(name, snap.frame, fresh.frame):
+                    self._forget_archive(expire=False)
+                self._snapshots[name] = snap = fresh
+        snap.fetched_at = max(snap.fetched_at, fetched_at)
+        snap.retry_at = max(snap.retry_at, retry_at)
+        METRICS.gauge("gms_shared_snapshot_version", latest.version, tab=name)
+        return snap
+
+    def _replay(self, name, snap, changes):
+        """Apply a published delta to ``snap`` in place, recording it in ``snap.changes`` like a delta sync.
+
+        Only for a snapshot showing the sheet as-is (no queued or local writes).
+        """
+        with self._lock:
+            frame, n = snap.frame, len(snap.frame)
+            rows = [change[1] for change in changes if change[0] == "append"]
+            if rows:
+                frame = concat_typed(name, frame, pd.DataFrame(rows, columns=frame.columns))
+            else:
+                frame = frame.copy(deep=False)
+            for change in changes:
+                if change[0] == "append":
+                    snap.changes.append(("append", n))
+                    n += 1
+                    continue
+                pos, after = change[1], change[2]
+                before = {column: cell_text(frame.at[frame.index[pos], column]) for column in after}
+                for column, text in after.items():
+                    set_cell(frame, pos, column, text)
+                snap.changes.append(("update", pos, after, before))
+                if INDEXED.get(name) in after:
+                    snap.epoch += 1
+            snap.frame = snap.sheet = frame
+
+    def _publish(self, name, snap):
+        """Share what this process's refresh of ``name`` read from Sheets with the others.
+
+        Queued and local writes are not part of it: ``snap.sheet`` is
+        published, with its delta from the version it was based on.
+        """
+        fetched_at = time.time() - (time.monotonic() - snap.fetched_at)
+        if time.monotonic() < snap.retry_at:
+            self._shared.defer(name, time.time() + (snap.retry_at - time.monotonic()))
+            return
+        with self._lock:
+            sheet, base, published = snap.sheet, snap.version, snap.published
+        delta = None if base is None or sheet is published else self._sheet_delta(name, published, sheet)
+        if base is not None and (sheet is published or delta == []):
+            self._shared.touch(name, base, fetched_at)
+            with self._lock:
+                snap.published = sheet
+            return
+        version = self._shared.publish(name, sheet, fetched_at, base=base, changes=delta)
+        with self._lock:
+            snap.version, snap.published = version, sheet
+        METRICS.gauge("gms_shared_snapshot_version", version, tab=name)
+
+    @staticmethod
+    def _sheet_delta(name, old, new):
+        """Changes turning sheet frame ``old`` into ``new``, as ``_replay`` takes them; None if rows moved."""
+        if name not in MUTABLE or list(old.columns) != list(new.columns) or SheetStore._rows_moved(name, old, new):
+            return None
+        span, m = list(MUTABLE[name]), len(old)
+        diff = np.column_stack([comparable(old[column], new[column].iloc[:m]) !=
+                                comparable(new[column].iloc[:m], old[column]) for column in span])
+        delta = [["update", int(pos), {column: cell_text(new[column].iat[pos])
+                                       for j, column in enumerate(span) if diff[pos, j]}]
+                 for pos in diff.any(axis=1).nonzero()[0]]
+        delta.extend(["append", [cell_text(v) for v in new.iloc[pos]]] for pos in range(m, len(new)))
+        return delta
+
+    @staticmethod
+    def _rows_moved(name, old, new):
+        """True if rows of ``old`` are no longer at the same position in ``new`` (deleted, e.g. archived)."""
+        key = INDEXED.get(name)
+        if key not in old.columns or key not in new.columns or len(new) < len(old):
+            return True
+        return not (new[key].iloc[:len(old)].to_numpy(dtype=object) == old[key].to_numpy(dtype=object)).all()
+
+    def _forget_archive(self, expire=True):
+        """Re-list the archive tabs and drop their snapshots; rows may have just moved there."""
+        with self._lock:
+            self._listed_at = 0.0
+            for tab in [t for t in self._snapshots if is_archive(t)]:
+                if expire:
+                    self.invalidate(tab)
+                else:
+                    self._snapshots.pop(tab)
+
+    @staticmethod
+    def _fresh(name, snap):
+        if snap is None:
+            return False
+        now = time.monotonic()
+        return now - snap.fetched_at <= ttl(name) or now < snap.retry_at
+
+    def set_overlay(self, name, pending):
+        """Register ``pending()``, writes accepted but maybe not yet in the sheet.
+
+        It returns ``[("append", key, values) | ("update", key, fields)]`` in
+        order, and they are re-applied on top of every full load and delta
+        sync so queued writes never disappear from view.
+        """
+        self._overlays[name] = pending
+
+    def _pending(self, name):
+        """``(keys queued for append, {key: fields queued for update})`` from the overlay of ``name``."""
+        overlay = self._overlays.get(name)
+        appends, updates = set(), {}
+        for kind, k, payload in overlay() if overlay is not None else ():
+            if kind == "append":
+                appends.add(k)
+            else:
+                updates.setdefault(k, {}).update(payload)
+        return appends, updates
+
+    def read_columns(self, name, columns):
+        """Only ``columns`` of tab ``name`` (those that exist) as a DataFrame.
+
+        One ``batch_get`` reads the header row plus one whole-column range per
+        column, column-major, so the frame is built straight from the arrays.
+        The header is remembered; if the sheet's header no longer matches it,
+        the read is redone against the new one.
+        """
+        header = self._headers.get(name) or self.call(name, "row_values", 1)
+        for _ in (0, 1):
+            wanted = [column for column in columns if column in header]
+            letters = [col_letter(header.index(column) + 1) for column in wanted]
+            first, *values = self.call(name, "batch_get", ["1:1"] + [f"{c}2:{c}" for c in letters],
+                                       major_dimension="COLUMNS")
+            current = [cells[0] if cells else "" for cells in first]
+            self._headers[name] = current
+            if [c for c in columns if c in current] == wanted and \
+                    all(current.index(c) == header.index(c) for c in wanted):
+                break
+            header = current
+        return frame_from_columns({column: cells[0] if cells else [] for column, cells in zip(wanted, values)})
+
+    def _full_load(self, name):
+        if name in PROJECTED:
+            return self.read_columns(name, PROJECTED[name])
+        return frame_from_values(self.call(name, "get_all_values"))
+
+    def _overlaid(self, name, frame):
+        """Typed ``frame`` with the overlay's queued writes applied on top."""
+        overlay = self._overlays.get(name)
+        key = INDEXED.get(name)
+        if overlay is None or key not in frame.columns:
+            return frame
+        pending = overlay()
+        if not pending:
+            return frame
+        positions = {k: i for i, k in enumerate(frame[key])}
+        appends = []
+        for kind, k, payload in pending:
+            if kind == "append" and k not in positions:
+                positions[k] = len(frame) + len(appends)
+                appends.append([str(v) for v in payload])
+        if appends:
+            frame = concat_typed(name, frame, pd.DataFrame(appends, columns=frame.columns))
+        else:
+            frame = frame.copy(deep=False)
+        for kind, k, payload in pending:
+            if kind == "update" and k in positions:
+                for column, value in payload.items():
+                    set_cell(frame, positions[k], column, str(value))
+        return frame
+
+    def _delta_sync(self, name, snap):
+        """Refresh ``snap`` from a narrow read; returns the snapshot to serve, or None if it needs a full reload.
+
+        Queued writes are laid over what the sheet returns, as on a full load,
+        so a transition waiting in the queue does not flip back on the next
+        sync. Rows queued for append sit at the end of the frame and are not
+        in the sheet yet; only the rows before them are read and compared.
+        """
+        appends, updates = self._pending(name)  # before the read: whatever is flushed after it is still listed
+        with self._lock:
+            frame, seen, old_sheet = snap.frame, len(snap.changes), snap.sheet
+        plain = not appends and not updates  # nothing queued: after the sync, the served frame is the sheet
+        header, n = list(frame.columns), len(frame)
+        key = INDEXED[name]
+        if n == 0 or key not in header or not set(MUTABLE[name]) <= set(header):
+            return None
+        frame_keys = frame[key].tolist()
+        s = n  # rows the sheet should already have
+        while s and frame_keys[s - 1] in appends:
+            s -= 1
+        if s == 0:
+            return None
+        key_col = header.index(key) + 1
+        mutable = sorted(header.index(column) + 1 for column in MUTABLE[name])
+        lo, hi = mutable[0], mutable[-1]
+        keys, current, tail = self.call(name, "batch_get", [
+            f"{col_letter(key_col)}2:{col_letter(key_col)}{s + 1}",
+            f"{col_letter(lo)}2:{col_letter(hi)}{s + 1}",
+            f"A{s + 2}:{col_letter(len(header))}",
+        ])
+        keys = [row[0] if row else "" for row in keys] + [""] * (s - len(keys))
+        if keys != frame_keys[:s]:
+            # Rows were inserted, deleted or moved: positions are no longer valid.
+            # Deleted rows may have gone to the archive, so look at it afresh too.
+            if name == "GRIEVANCE":
+                self._forget_archive()
+            return None
+        span = header[lo - 1:hi]
+        tail = frame_from_values([header] + list(tail))
+        # Queued appends that were flushed meanwhile are now ordinary sheet rows.
+        landed = 0
+        for k in tail[key] if not tail.empty else ():
+            if s + landed == n or k != frame_keys[s + landed]:
+                break
+            landed += 1
+        rows = list(current) + [[]] * (s - len(current)) + tail[span].iloc[:landed].values.tolist()
+        current = typed_frame(name, frame_from_values([span] + rows))
+        s, tail = s + landed, tail.iloc[landed:]
+        # The sheet as read, before queued writes go on top (what ``_publish`` shares).
+        sheet = frame.iloc[:s].assign(**{column: current[column].copy().array for column in span})
+        if not tail.empty:
+            sheet = concat_typed(name, sheet, tail)
+        if self._sheet_delta(name, old_sheet, sheet) == []:
+            sheet = old_sheet
+        if not tail.empty and s < n:
+            # Another worker appended ahead of our queued rows: rebuild with them after its rows.
+            return Snapshot(self._overlaid(name, sheet), self._lock, sheet=sheet)
+        for k, fields in updates.items():
+            pos = self._position(snap, name, k)
+            if pos is not None and pos < s:
+                for column, value in fields.items():
+                    if column in span:
+                        set_cell(current, pos, column, str(value))
+        if not tail.empty:
+            tail = tail.copy()
+            for i, k in enumerate(tail[key]):
+                for column, value in updates.get(k, {}).items():
+                    tail.iat[i, header.index(column)] = str(value)
+        diff = np.column_stack([comparable(frame[column].iloc[:s], current[column]) !=
+                                comparable(current[column], frame[column]) for column in span])
+        with self._lock:
+            if snap.frame is not frame or len(snap.changes) != seen:
+                return snap  # a local write landed meanwhile; sync again next time
+            snap.fetched_at, snap.sheet = time.monotonic(), sheet
+            if not diff.any() and tail.empty:
+                if plain and sheet is not frame:
+                    snap.sheet = frame
+                return snap
+            frame = frame.copy(deep=False)
+            for pos in diff.any(axis=1).nonzero()[0]:
+                changed = {column: cell_text(current.iat[pos, j]) for j, column in enumerate(span) if diff[pos, j]}
+                before = {column: cell_text(frame.iat[pos, header.index(column)]) for column in changed}
+                snap.changes.append(("update", int(pos), changed, before))
+            for j, column in enumerate(span):
+                if not diff[:, j].any():
+                    continue
+                if s == n:
+                    frame[column] = current[column].array
+                else:  # queued appends follow; patch just the changed cells
+                    for pos in diff[:, j].nonzero()[0]:
+                        set_cell(frame, pos, column, cell_text(current.iat[pos, j]))
+            if not tail.empty:
+                snap.changes.extend(("append", pos) for pos in range(n, n + len(tail)))
+                frame = concat_typed(name, frame, tail)
+            snap.frame = frame
+            if plain:
+                snap.sheet = frame
+        return snap
+
+    def records(self, name):
+        """Whole tab as a DataFrame, served from cache while younger than its TTL."""
+        return self.snapshot(name).frame
+
+    def peek(self, name):
+        """Cached snapshot of ``name`` whatever its age, or None; never hits the network."""
+        snap = self._snapshots.get(name)
+        return None if snap is None else snap.frame
+
+    def _position(self, snap, name, key):
+        with self._lock:
+            index = self._indexes[name]
+            index.sync(snap)
+            return index.positions.get(norm_key(key))
+
+    def lookup(self, name, key):
+        """Row of tab ``name`` whose ``INDEXED[name]`` column equals ``key``, as a dict, or None."""
+        snap = self.snapshot(name)
+        pos = self._position(snap, name, key)
+        return None if pos is None else snap.frame.iloc[pos].to_dict()
+
+    def invalidate(self, name=None):
+        """Drop the cached snapshot of ``name`` (all if None), here and in the shared copy."""
+        with self._lock:
+            names = list(self._snapshots) if name is None else [name]
+            for tab in names:
+                self._snapshots.pop(tab, None)
+                if self._shared is not None:
+                    self._shared.expire(tab)
+
+    # --- WRITES ---
+    # ``write_*`` only talk to Sheets and ``patch_*`` only touch the cached
+    # snapshot. The write-behind queue (writer.py) patches when a write is
+    # accepted and writes when it flushes.
+    def write_rows(self, name, rows):
+        """Append ``rows`` with one ``append_rows`` call; returns the sheet row of the first."""
+        resp = self.call(name, "append_rows", rows)
+        start = int(re.search(r"\d+", resp["updates"]["updatedRange"].split("!")[-1]).group())
+        # Rows patched in locally assumed nobody else appended in between. If
+        # that was wrong, their positions are too: drop the snapshot.
+        with self._lock:
+            snap = self._snapshots.get(name)
+            key = INDEXED.get(name)
+            if snap is not None and key in snap.frame.columns:
+                col = list(snap.frame.columns).index(key)
+                for i, values in enumerate(rows):
+                    pos = self._position(snap, name, values[col])
+                    if pos is not None and pos + 2 != start + i:
+                        self.invalidate(name)
+                        break
+        return start
+
+    def write_fields(self, name, updates):
+        """Apply ``[(key, {column: value}), ...]`` with a single ``batch_update``; returns the keys not found.
+
+        Rows come from the ``INDEXED`` key index, and their key cells are read
+        back in one ``batch_get`` before writing: rows may have moved since the
+        snapshot (archived elsewhere). Keys the snapshot has not seen yet, or
+        whose row no longer holds them, are looked up again (``find``, or one
+        read of the key column for several). Keys the sheet doesn't have are
+        skipped, and the rest are written. Each row's columns are grouped into
+        runs of adjacent cells, one range per run.
+        """
+        snap = self.snapshot(name)
+        header = list(snap.frame.columns)
+        key_col = header.index(INDEXED[name]) + 1
+        rows = {}
+        for key, _ in updates:
+            pos = self._position(snap, name, key)
+            rows[key] = None if pos is None else pos + 2
+        with self.hold_rows(name) as held:
+            if not held:
+                raise TimeoutError(f"{name} rows are being moved; try again shortly")
+            known = [key for key, row in rows.items() if row is not None]
+            if known:
+                first, last = min(rows[k] for k in known), max(rows[k] for k in known)
+                letter = col_letter(key_col)
+                cells = self.call(name, "batch_get", [f"{letter}{first}:{letter}{last}"])[0]
+                for key in known:
+                    cell = cells[rows[key] - first] if rows[key] - first < len(cells) else []
+                    if not cell or norm_key(cell[0]) != norm_key(key):
+                        rows[key] = None
+            moved = [key for key in known if rows[key] is None]
+            unknown = [key for key, row in rows.items() if row is None]
+            if len(unknown) == 1:
+                cell = self.call(name, "find", str(unknown[0]), in_column=key_col)
+                rows[unknown[0]] = None if cell is None else cell.row
+            elif unknown:
+                where = {}
+                for row, value in enumerate(self.call(name, "col_values", key_col), start=1):
+                    where.setdefault(norm_key(value), row)
+                rows.update((key, where.get(norm_key(key))) for key in unknown)
+            data, missing = [], []
+            for key, fields in updates:
+                row = rows[key]
+                if row is None:
+                    missing.append(key)
+                    continue
+                runs = []
+                for col in sorted(header.index(column) + 1 for column in fields):
+                    if runs and col == runs[-1][-1] + 1:
+                        runs[-1].append(col)
+                    else:
+                        runs.append([col])
+                data.extend(
+                    {"range": f"{rowcol_to_a1(row, run[0])}:{rowcol_to_a1(row, run[-1])}",
+                     "values": [[fields[header[col - 1]] for col in run]]}
+                    for run in runs
+                )
+            if data:
+                self.call(name, "batch_update", data)
+        if moved:
+            self.invalidate(name)  # the snapshot's positions are out of date
+        return missing
+
+    def hold_rows(self, name, exclusive=False, wait=ROWS_WAIT):
+        """Lock tab ``name``'s row numbers across processes: shared to write by row, exclusive to delete.
+
+        Yields False if not had within ``wait``. Without ``fcntl`` nothing is
+        locked and it yields True.
+        """
+        if not shared.available():
+            return nullcontext(True)
+        os.makedirs(DATA_DIR, exist_ok=True)
+        return shared.file_lock(os.path.join(DATA_DIR, f"{name}.rows.lock"), wait, exclusive=exclusive)
+
+    def delete_rows(self, name, rows):
+        """Delete the given 1-based sheet rows of tab ``name`` with one ``batch_update``.
+
+        Rows below shift up, so every cached position for the tab is dropped.
+        """
+        ws = self.worksheet(name)
+        runs = []  # [first, last], bottom-most first so earlier deletes don't move later ones
+        for row in sorted(set(rows), reverse=True):
+            if runs and row == runs[-1][0] - 1:
+                runs[-1][0] = row
+            else:
+                runs.append([row, row])
+        if runs:
+            self.call(None, "batch_update", {"requests": [
+                {"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS",
+                                               "startIndex": first - 1, "endIndex": last}}}
+                for first, last in runs
+            ]})
+        self.invalidate(name)
+
+    def patch_append(self, name, values):
+        with self._lock:
+            snap = self._snapshots.get(name)
+            if snap is None:
+                return
+            if len(values) != len(snap.frame.columns):
+                self._snapshots.pop(name)
+                return
+            row = pd.DataFrame([[str(v) for v in values]], columns=snap.frame.columns)
+            snap.changes.append(("append", len(snap.frame)))
+            snap.frame = concat_typed(name, snap.frame, row)
+            snap.patched_at = time.time()
+
+    def patch_fields(self, name, key, fields):
+        self.patch_many(name, [(key, fields)])
+
+    def patch_many(self, name, updates):
+        """``patch_fields`` for ``[(key, fields), ...]``, on a single copy of the frame."""
+        with self._lock:
+            snap = self._snapshots.get(name)
+            if snap is None:
+                return
+            frame = None
+            for key, fields in updates:
+                pos = self._position(snap, name, key)
+                if pos is None:
+                    continue  # not in our snapshot yet; the next sync brings it in
+                if frame is None:
+                    frame = snap.frame.copy(deep=False)
+                before, after = {}, {}
+                for column, value in fields.items():
+                    before[column] = cell_text(frame.at[frame.index[pos], column])
+                    after[column] = set_cell(frame, pos, column, str(value))
+                snap.changes.append(("update", pos, after, before))
+                if INDEXED.get(name) in fields:
+                    snap.epoch += 1
+            if frame is not None:
+                snap.frame = frame
+                snap.patched_at = time.time()
+
+    # --- BACKGROUND TOKEN REFRESH ---
+    def _token_loop(self):
+        while True:
+            time.sleep(TOKEN_CHECK_EVERY)
+            with self._lock:
+                creds = self._creds
+            if creds is None or creds.expiry is None:
+                continue
+            left = (creds.expiry - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()
+            if left > TOKEN_REFRESH_MARGIN:
+                continue
+            try:
+                creds.refresh(Request())
+            except Exception:
+                self.reset()
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    return SheetStore(st.secrets["gcp_service_account"],
+                      shared=shared.SharedSnapshots(SHARED_DIR) if SHARE_SNAPSHOTS else None)
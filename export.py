@@ -0,0 +1,71 @@
+"""CSV and XLSX export of grievances from the local mirror.
+
+Both formats are written chunk by chunk from ``GrievanceMirror.stream``
+into a temporary file, so an export of several years of grievances (archive
+included) never holds more than a few thousand rows in Python. The XLSX
+uses openpyxl's write-only mode, which also spools each sheet to disk as it
+is written. After the Grievances sheet it has pivot sheets by type, section
+and officer, each with counts per status and the average days to resolve.
+
+The dashboard hands ``to_csv``/``to_xlsx`` to ``st.download_button`` as
+deferred data. Nothing is generated until the admin clicks the button. Both
+return the finished file opened for reading (a ``BufferedReader``, one of
+the types the button accepts); it is already unlinked, so it goes away once
+Streamlit has read it and the handle is dropped.
+"""
+import codecs
+import os
+import tempfile
+
+from openpyxl import Workbook
+
+HIDDEN = ("_ROW", "_FILED")  # mirror bookkeeping, not sheet columns
+PIVOTS = {"By Type": "GRIEVANCE_TYPE", "By Section": "SECTION", "By Officer": "MARKED_OFFICER"}
+
+
+def _written(write, suffix):
+    """Run ``write(file)`` on a new temporary file; returns the result opened for reading."""
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as out:
+        write(out)
+    try:
+        return open(out.name, "rb")
+    finally:
+        os.unlink(out.name)
+
+
+def _chunks(mirror, filters):
+    for chunk in mirror.stream(**filters):
+        yield chunk.drop(columns=[c for c in HIDDEN if c in chunk.columns])
+
+
+def to_csv(mirror, filters):
+    """UTF-8 CSV (with BOM, so Excel reads Hindi text) of the grievances matching ``filters``."""
+    def write(out):
+        out.write(codecs.BOM_UTF8)
+        for i, chunk in enumerate(_chunks(mirror, filters)):
+            chunk.to_csv(out, header=i == 0, index=False, encoding="utf-8")
+    return _written(write, ".csv")
+
+
+def _rows(frame):
+    yield list(frame.columns)
+    yield from frame.astype(object).where(frame.notna(), None).values.tolist()
+
+
+def to_xlsx(mirror, filters):
+    """Workbook of the grievances matching ``filters`` plus summary pivot sheets."""
+    book = Workbook(write_only=True)
+    sheet = book.create_sheet("Grievances")
+    header = False
+    for chunk in _chunks(mirror, filters):
+        rows = _rows(chunk)
+        if header:
+            next(rows)
+        header = True
+        for row in rows:
+            sheet.append(row)
+    for title, column in {"Summary": None, **PIVOTS}.items():
+        sheet = book.create_sheet(title)
+        for row in _rows(mirror.breakdown(column, **filters)):
+            sheet.append(row)
+    return _written(book.save, ".xlsx")
@@ -0,0 +1,175 @@
+"""Process-wide timings and counters for Sheets calls, caches and page renders.
+
+``METRICS`` is a module-level singleton, so it survives reruns and is shared
+by every session in the process. Timings keep an exact count/sum plus the
+last ``SAMPLES`` observations for p50/p95/p99. ``prometheus()`` renders
+everything in the Prometheus text format. It is served on
+``GMS_METRICS_PORT`` when that is set, and shown on the admin Diagnostics
+page. The endpoint has no auth, so it listens on ``GMS_METRICS_HOST``,
+loopback unless set otherwise.
+"""
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLES = 2048
+METRICS_HOST = "127.0.0.1"  # default bind address of /metrics; GMS_METRICS_HOST overrides it
+QUANTILES = (0.5, 0.95, 0.99)
+
+HELP = {
+    "gms_sheets_call_seconds": "Latency of Google Sheets API calls.",
+    "gms_sheets_errors_total": "Failed Google Sheets API calls, by HTTP status (0 = transport).",
+    "gms_sheets_retries_total": "Sheets calls retried after an error.",
+    "gms_cache_requests_total": "Snapshot reads by outcome (hit, coalesced, shared, delta, miss, stale).",
+    "gms_page_render_seconds": "Wall time of one script run, by page.",
+    "gms_write_queue_flushed_total": "Journal entries written to Sheets.",
+    "gms_write_queue_failed_total": "Journal entries whose flush failed and was rescheduled.",
+    "gms_write_queue_backlog": "Journal entries not yet written to Sheets.",
+    "gms_write_queue_dead": "Journal entries given up on after MAX_ATTEMPTS failures of their own.",
+    "gms_quota_wait_seconds": "Time spent waiting for a Sheets quota token, by priority.",
+    "gms_quota_timeouts_total": "Sheets calls abandoned for lack of quota, by priority.",
+    "gms_unparsed_dates_total": "Date cells not in DATE_FORMAT, kept as text (counted on each load).",
+    "gms_shared_snapshot_version": "Newest cross-process snapshot version seen, by tab.",
+}
+
+
+def quantile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = Counter()
+        self._gauges = {}
+        self._counts = Counter()
+        self._sums = defaultdict(float)
+        self._samples = defaultdict(lambda: deque(maxlen=SAMPLES))
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name, n=1, **labels):
+        with self._lock:
+            self._counters[self._key(name, labels)] += n
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counts[key] += 1
+            self._sums[key] += seconds
+            self._samples[key].append(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    # --- READS ---
+    def counters(self, name):
+        """``[(labels dict, value), ...]`` for counter ``name``."""
+        with self._lock:
+            return [(dict(labels), v) for (n, labels), v in self._counters.items() if n == name]
+
+    def timings(self, name):
+        """``[{**labels, count, mean_ms, p50_ms, p95_ms, p99_ms}, ...]`` for timer ``name``."""
+        with self._lock:
+            series = [(labels, self._counts[(n, labels)], self._sums[(n, labels)], list(self._samples[(n, labels)]))
+                      for (n, labels) in self._counts if n == name]
+        rows = []
+        for labels, count, total, samples in series:
+            row = dict(labels)
+            row.update(count=count, mean_ms=round(1000 * total / count, 1))
+            for q in QUANTILES:
+                row[f"p{int(q * 100)}_ms"] = round(1000 * quantile(samples, q), 1)
+            rows.append(row)
+        return sorted(rows, key=lambda r: -r["count"])
+
+    def prometheus(self):
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timers = sorted((key, self._counts[key], self._sums[key], list(self._samples[key])) for key in self._counts)
+        lines, seen = [], set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+            lines.append(f"{name}{fmt(labels)} {value}")
+        for (name, labels), value in gauges:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} gauge"]
+            lines.append(f"{name}{fmt(labels)} {value}")
+        for (name, labels), count, total, samples in timers:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} summary"]
+            for q in QUANTILES:
+                lines.append(f"{name}{fmt(labels, [('quantile', q)])} {quantile(samples, q):.6f}")
+            lines.append(f"{name}_sum{fmt(labels)} {total:.6f}")
+            lines.append(f"{name}_count{fmt(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+# ==========================================
+# PROMETHEUS ENDPOINT (opt-in)
+# ==========================================
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_exporter_lock = threading.Lock()
+_exporter = None
+
+
+def start_exporter():
+    """Serve ``/metrics`` on ``$GMS_METRICS_HOST:$GMS_METRICS_PORT`` (once per process); no-op if unset or taken."""
+    global _exporter
+    port = os.environ.get("GMS_METRICS_PORT")
+    if not port:
+        return
+    with _exporter_lock:
+        if _exporter is not None:
+            return
+        try:
+            _exporter = ThreadingHTTPServer((os.environ.get("GMS_METRICS_HOST", METRICS_HOST), int(port)), _Handler)
+        except OSError:
+            _exporter = False  # another worker on this host already serves it
+            return
+        threading.Thread(target=_exporter.serve_forever, name="gms-metrics", daemon=True).start()
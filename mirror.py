@@ -0,0 +1,252 @@
+"""Local DuckDB mirror of the GRIEVANCE tab for dashboard queries.
+
+The dashboards, status check and scorecards used to filter a pandas copy of
+the whole sheet on every rerun. They now run SQL against a DuckDB table that
+mirrors the GRIEVANCE snapshot held by ``db.SheetStore``:
+
+* a background thread re-syncs every ``SYNC_EVERY`` seconds, so the TTL
+  refetch happens off the request path;
+* the app's own writes are replayed from ``Snapshot.changes`` as single-row
+  INSERT/UPDATEs, so they are visible on the next rerun without a reload;
+* a new snapshot (TTL refetch) replaces the table wholesale.
+
+Archived grievances (archive.py) live in a second table, ``archive``, built
+from the archive tabs' snapshots when a query needs history: the status
+check and the RESOLVED/ALL filters. Archive rows get negative ``_ROW``s, so
+they sort before (older than) everything in the live tab.
+
+All columns are VARCHAR plus ``_ROW``, the 1-based sheet row, and
+``_FILED``, DATE_TIME as a TIMESTAMP for date-range filters; the typed
+snapshot's date columns are formatted back to the sheet's text. DuckDB keeps
+zone maps on every column; STATUS, HRMS_ID and MARKED_OFFICER also get ART
+indexes for the selective lookups.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import duckdb
+import pandas as pd
+import streamlit as st
+
+from db import DATE_FORMAT, MISSING_DATE, SnapshotFollower, get_store
+from quota import BACKGROUND, priority
+
+TAB = "GRIEVANCE"
+SYNC_EVERY = 5  # seconds
+STREAM_VECTORS = 4  # DuckDB vectors (2048 rows each) per chunk yielded by ``stream``
+INDEXED_COLUMNS = ("STATUS", "HRMS_ID", "MARKED_OFFICER")
+STATUSES = ("NEW", "UNDER PROCESS", "RESOLVED")
+BLANK_LABEL = "(blank)"  # ``breakdown`` group of rows with nothing in the ``by`` column
+
+# Sort orders offered by the dashboards, as ORDER BY clauses.
+ORDERS = {
+    "sheet": "_ROW",
+    "newest": "_ROW DESC",
+    "oldest_pending": "STATUS = 'RESOLVED', _ROW",
+}
+
+
+def select_text(frame):
+    """SELECT list rendering every column of ``frame`` as the sheet's text, then ``_FILED``."""
+    columns = []
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_dtype(frame[column].dtype):
+            columns.append(f"coalesce(strftime(\"{column}\", '{DATE_FORMAT}'), '{MISSING_DATE}') AS \"{column}\"")
+        else:
+            columns.append(f'"{column}"::VARCHAR AS "{column}"')
+    if "DATE_TIME" not in frame.columns:
+        columns.append("NULL::TIMESTAMP AS _FILED")
+    elif pd.api.types.is_datetime64_dtype(frame["DATE_TIME"].dtype):
+        columns.append('"DATE_TIME"::TIMESTAMP AS _FILED')
+    else:  # kept as text because some cells don't parse; those get no _FILED
+        columns.append(f"try_strptime(\"DATE_TIME\", '{DATE_FORMAT}') AS _FILED")
+    return ", ".join(columns)
+
+
+class GrievanceMirror(SnapshotFollower):
+    def __init__(self, store, path=":memory:"):
+        super().__init__(store, TAB)
+        self._con = duckdb.connect(path)
+        self._columns = []
+        self._archive = []  # archive snapshots the ``archive`` table was built from
+        threading.Thread(target=self._sync_loop, name="gms-mirror-sync", daemon=True).start()
+
+    # --- SYNC ---
+    def _sync_loop(self):
+        while True:
+            time.sleep(SYNC_EVERY)
+            try:
+                with priority(BACKGROUND):
+                    self.sync()
+            except Exception:
+                pass  # keep serving the last good mirror; the next tick retries
+
+    def _load(self, frame):
+        self._con.execute("DROP TABLE IF EXISTS grievance")
+        self._columns = list(frame.columns)
+        if self._columns:
+            self._con.register("_src", frame)
+            self._con.execute(
+                f"CREATE TABLE grievance AS SELECT (row_number() OVER () + 1)::INTEGER AS _ROW, "
+                f"{select_text(frame)} FROM _src"
+            )
+            self._con.unregister("_src")
+            for column in INDEXED_COLUMNS:
+                if column in self._columns:
+                    self._con.execute(f'CREATE INDEX "idx_{column}" ON grievance ("{column}")')
+
+    def _apply(self, frame, change):
+        if change[0] == "append":
+            pos = change[1]
+            self._con.register("_src", frame.iloc[pos:pos + 1])
+            self._con.execute(f"INSERT INTO grievance SELECT {pos + 2}, {select_text(frame)} FROM _src")
+            self._con.unregister("_src")
+        else:
+            pos, fields = change[1], change[2]
+            sets = ", ".join(f'"{column}" = ?' for column in fields)
+            self._con.execute(
+                f"UPDATE grievance SET {sets} WHERE _ROW = ?",
+                [str(value) for value in fields.values()] + [pos + 2],
+            )
+
+    def _sync_archive(self):
+        """Rebuild table ``archive`` if the archive tabs changed; False when there is no archive."""
+        snaps = [self._store.snapshot(tab) for tab in self._store.archive_tabs()]
+        with self._lock:
+            if len(snaps) != len(self._archive) or any(a is not b for a, b in zip(snaps, self._archive)):
+                self._con.execute("DROP TABLE IF EXISTS archive")
+                frames = [snap.frame for snap in snaps if not snap.frame.empty]
+                start = -sum(len(frame) for frame in frames)
+                for i, frame in enumerate(frames):
+                    verb = "INSERT INTO archive BY NAME" if i else "CREATE TABLE archive AS"
+                    self._con.register("_src", frame)
+                    self._con.execute(
+                        f"{verb} SELECT (row_number() OVER () - 1 + {start})::INTEGER AS _ROW, "
+                        f"{select_text(frame)} FROM _src"
+                    )
+                    self._con.unregister("_src")
+                    start += len(frame)
+                self._archive = snaps
+            return any(not snap.frame.empty for snap in snaps)
+
+    # --- QUERIES ---
+    def query(self, sql, params=(), tables=None):
+        """Run ``sql`` against the mirror (table ``grievance``) and return a DataFrame.
+
+        ``tables`` maps names to DataFrames made visible to ``sql`` for this query.
+        """
+        self.ensure()
+        with self._lock:
+            if not self._columns:
+                return pd.DataFrame()
+            for name, frame in (tables or {}).items():
+                self._con.register(name, frame)
+            try:
+                return self._con.execute(sql, list(params)).df()
+            finally:
+                for name in tables or {}:
+                    self._con.unregister(name)
+
+    def _filter(self, status=None, officer=None, hrms_id=None, g_type=None, section=None, filed_from=None, filed_to=None,
+                refs=None):
+        """``(source, where, params, tables)`` selecting the grievances that match every filter given.
+
+        ``filed_from``/``filed_to`` are dates (inclusive) on DATE_TIME, and
+        ``refs`` a collection of REFERENCE_NOs, e.g. search hits. Archived
+        grievances are included unless ``status`` rules RESOLVED out.
+        """
+        statuses = None if status is None else [status] if isinstance(status, str) else list(status)
+        source = "grievance"
+        if (statuses is None or "RESOLVED" in statuses) and self._sync_archive():
+            # Rows an interrupted archive run left in both places count once.
+            source = ("(SELECT * FROM grievance UNION ALL BY NAME SELECT * FROM archive"
+                      " WHERE REFERENCE_NO NOT IN (SELECT REFERENCE_NO FROM grievance)) AS g")
+        clauses, params, tables = [], [], {}
+        for column, value in (("MARKED_OFFICER", officer), ("HRMS_ID", hrms_id), ("GRIEVANCE_TYPE", g_type),
+                              ("SECTION", section)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+        if statuses is not None:
+            clauses.append(f"STATUS IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if filed_from is not None:
+            clauses.append("_FILED >= ?")
+            params.append(datetime.combine(filed_from, datetime.min.time()))
+        if filed_to is not None:
+            clauses.append("_FILED < ?")
+            params.append(datetime.combine(filed_to + timedelta(days=1), datetime.min.time()))
+        if refs is not None:
+            clauses.append("REFERENCE_NO IN (SELECT ref FROM _refs)")
+            tables["_refs"] = pd.DataFrame({"ref": list(refs)}, dtype="str")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return source, where, params, tables
+
+    def grievances(self, order="sheet", limit=None, offset=0, columns=None, **filters):
+        """Grievances matching ``filters`` (see ``_filter``), sorted by ``ORDERS[order]``.
+
+        With ``limit`` only that page is materialised, so the cost of a
+        dashboard render does not depend on how many grievances match.
+        ``columns`` projects the result onto just those columns.
+        """
+        source, where, params, tables = self._filter(**filters)
+        page = ""
+        if limit is not None:
+            page = "LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        select = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        return self.query(f"SELECT {select} FROM {source} {where} ORDER BY {ORDERS[order]} {page}", params, tables)
+
+    def count(self, **filters):
+        """Number of grievances matching ``filters``."""
+        source, where, params, tables = self._filter(**filters)
+        result = self.query(f"SELECT count(*) AS n FROM {source} {where}", params, tables)
+        return int(result["n"].iat[0]) if not result.empty else 0
+
+    def stream(self, columns=None, **filters):
+        """Yield the grievances matching ``filters``, in sheet order, as DataFrames of a few thousand rows.
+
+        The query runs on its own cursor, so syncs carry on while a long
+        export is read and the export sees one consistent version of the mirror.
+        """
+        self.ensure()
+        source, where, params, tables = self._filter(**filters)
+        select = ", ".join(f'"{column}"' for column in columns) if columns else "*"
+        with self._lock:
+            if not self._columns:
+                return
+            cursor = self._con.cursor()
+            for name, frame in tables.items():
+                cursor.register(name, frame)
+            result = cursor.execute(f"SELECT {select} FROM {source} {where} ORDER BY {ORDERS['sheet']}", params)
+        try:
+            while True:
+                chunk = result.fetch_df_chunk(STREAM_VECTORS)
+                if chunk.empty:
+                    return
+                yield chunk
+        finally:
+            cursor.close()
+
+    def breakdown(self, by=None, **filters):
+        """Grievances matching ``filters`` per ``by`` value (one overall row without ``by``).
+
+        Columns: the ``by`` value, TOTAL, a count per status and
+        AVG_RESOLUTION_DAYS, the mean time from filing to resolution.
+        """
+        source, where, params, tables = self._filter(**filters)
+        key = f"coalesce(nullif(trim(\"{by}\"), ''), '{BLANK_LABEL}')" if by else "'ALL'"
+        counts = "".join(f", count(*) FILTER (STATUS = '{status}') AS \"{status}\"" for status in STATUSES)
+        days = f"date_diff('minute', _FILED, try_strptime(RESOLVE_DATE, '{DATE_FORMAT}')) / 1440"
+        group = "GROUP BY 1 ORDER BY TOTAL DESC, 1" if by else ""
+        return self.query(
+            f'SELECT {key} AS "{by or "GRIEVANCES"}", count(*) AS TOTAL{counts}, '
+            f"round(avg({days}) FILTER (STATUS = 'RESOLVED'), 1) AS AVG_RESOLUTION_DAYS "
+            f"FROM {source} {where} {group}",
+            params, tables)
+
+
+@st.cache_resource(show_spinner=False)
+def get_mirror():
+    return GrievanceMirror(get_store())
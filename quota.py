@@ -0,0 +1,103 @@
+"""Token-bucket scheduler for Google Sheets API traffic.
+
+Every Sheets call made through ``SheetStore.call`` first takes a token from
+one process-wide bucket sized to the project's per-minute quota. When the
+bucket is empty, callers queue by priority: queued writes go first, then
+interactive reads from a page render, then background refreshes. Within a
+priority, callers are served in arrival order.
+
+The priority comes from the calling thread (see ``priority()``). Background
+loops wrap their work in ``with priority(BACKGROUND)`` and the write-behind
+worker in ``with priority(WRITE)``. Script threads default to INTERACTIVE.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import METRICS
+
+# Sheets allows 60 read and 60 write requests per minute per user per project
+# by default; the service account is a single user.
+QUOTA_PER_MINUTE = int(os.environ.get("GMS_SHEETS_QUOTA", 60))
+BURST = 10          # tokens that can accumulate while idle
+PAUSE_ON_429 = 10   # seconds to stop issuing calls after the server says 429
+
+WRITE, INTERACTIVE, BACKGROUND = 0, 1, 2
+PRIORITY_NAMES = {WRITE: "write", INTERACTIVE: "interactive", BACKGROUND: "background"}
+# How long each priority may wait for a token before giving up.
+MAX_WAIT = {WRITE: 60, INTERACTIVE: 10, BACKGROUND: 30}
+
+_local = threading.local()
+
+
+class QuotaExceeded(Exception):
+    """No token became available within the caller's ``MAX_WAIT``."""
+
+
+@contextmanager
+def priority(level):
+    """Run the block's Sheets calls at ``level`` (WRITE, INTERACTIVE or BACKGROUND)."""
+    previous = current_priority()
+    _local.level = level
+    try:
+        yield
+    finally:
+        _local.level = previous
+
+
+def current_priority():
+    return getattr(_local, "level", INTERACTIVE)
+
+
+class TokenBucket:
+    def __init__(self, per_minute=QUOTA_PER_MINUTE, burst=BURST):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiting = []  # heap of (priority, arrival) tickets
+        self._arrivals = itertools.count()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self, level=None):
+        """Take one token, waiting behind higher-priority and earlier callers."""
+        level = current_priority() if level is None else level
+        ticket = (level, next(self._arrivals))
+        start = time.monotonic()
+        deadline = start + MAX_WAIT[level]
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    head = self._waiting[0] == ticket
+                    if head and now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    if now >= deadline:
+                        METRICS.inc("gms_quota_timeouts_total", priority=PRIORITY_NAMES[level])
+                        raise QuotaExceeded(f"no Sheets quota within {MAX_WAIT[level]}s")
+                    wait = deadline - now
+                    if head:
+                        wait = min(wait, max(self._paused_until - now, (1 - self._tokens) / self.rate))
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+        METRICS.observe("gms_quota_wait_seconds", time.monotonic() - start, priority=PRIORITY_NAMES[level])
+
+    def pause(self, seconds=PAUSE_ON_429):
+        """Issue nothing for ``seconds``; called when Sheets answers 429."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
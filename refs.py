@@ -0,0 +1,72 @@
+"""REFERENCE_NO allocation.
+
+A reference number is ``<IST yyyymmdd><HRMS_ID><seq:03d>``. The sequence
+comes from a counter table in a local SQLite file keyed by (HRMS_ID, day),
+bumped inside a ``BEGIN IMMEDIATE`` transaction so concurrent submissions,
+from any thread or worker process on this machine, never get the same
+number. Nothing here reads GRIEVANCE, except once per (HRMS_ID, day) to seed
+a fresh counter from refs already in the cached snapshot (e.g. after a
+redeploy wiped the local file).
+"""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from db import DATA_DIR, get_store
+
+SEQ_DB = os.path.join(DATA_DIR, "sequences.sqlite3")
+
+
+class RefAllocator:
+    def __init__(self, path, seed):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ref_seq ("
+            " hrms_id TEXT NOT NULL, day TEXT NOT NULL, seq INTEGER NOT NULL,"
+            " PRIMARY KEY (hrms_id, day))"
+        )
+        self._seed = seed
+        self._lock = threading.Lock()
+
+    def next(self, hrms_id, day):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT seq FROM ref_seq WHERE hrms_id = ? AND day = ?", (hrms_id, day)
+                ).fetchone()
+                seq = (row[0] if row else self._seed(hrms_id, day)) + 1
+                self._conn.execute(
+                    "INSERT INTO ref_seq (hrms_id, day, seq) VALUES (?, ?, ?)"
+                    " ON CONFLICT (hrms_id, day) DO UPDATE SET seq = excluded.seq",
+                    (hrms_id, day, seq),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return f"{day}{hrms_id}{str(seq).zfill(3)}"
+
+
+def seed_from_snapshot(hrms_id, day):
+    """Highest sequence already used for this (HRMS_ID, day) in the GRIEVANCE snapshot."""
+    store = get_store()
+    frame = store.peek("GRIEVANCE")
+    if frame is None:
+        frame = store.records("GRIEVANCE")
+    if frame.empty or "REFERENCE_NO" not in frame.columns:
+        return 0
+    prefix = f"{day}{hrms_id}"
+    refs = frame["REFERENCE_NO"].astype(str)
+    seqs = pd.to_numeric(refs[refs.str.startswith(prefix)].str[len(prefix):], errors="coerce").dropna()
+    return int(seqs.max()) if len(seqs) else 0
+
+
+@st.cache_resource(show_spinner=False)
+def get_allocator():
+    return RefAllocator(SEQ_DB, seed_from_snapshot)
@@ -0,0 +1,144 @@
+"""Inverted index for the admin dashboard's grievance search.
+
+Indexed text is GRIEVANCE_TEXT, OFFICER_REMARK, EMP_NAME and SECTION.
+Tokens are lower-cased runs of word characters or Devanagari. The explicit
+U+0900-U+097F range keeps matras and the virama inside a Hindi word, where
+``\\w`` alone would split it. A query matches grievances containing every
+query token as the start of some indexed word, so "sal" finds "salary" and
+"वेत" finds "वेतन".
+
+``SearchIndex`` follows the GRIEVANCE snapshot. A new snapshot re-tokenises
+only rows whose text changed; a submission indexes one row and a
+resolution re-indexes that row's remark. Archive tabs are indexed once per
+archive snapshot. Hits are REFERENCE_NOs, which ``GrievanceMirror`` combines
+with its status, type and date filters.
+"""
+import bisect
+import re
+from collections import defaultdict
+
+import streamlit as st
+
+from db import SnapshotFollower, get_store
+
+TAB = "GRIEVANCE"
+KEY = "REFERENCE_NO"
+FIELDS = ("GRIEVANCE_TEXT", "OFFICER_REMARK", "EMP_NAME", "SECTION")
+TOKEN = re.compile(r"[\w\u0900-\u097F]+")
+
+
+def tokenize(text):
+    return set(TOKEN.findall(str(text).lower()))
+
+
+def row_texts(frame):
+    """``{REFERENCE_NO: searchable text}`` for every row of ``frame``."""
+    columns = [column for column in FIELDS if column in frame.columns]
+    if frame.empty or KEY not in frame.columns or not columns:
+        return {}
+    text = frame[columns[0]].astype(str)
+    for column in columns[1:]:
+        text = text + " " + frame[column].astype(str)
+    return dict(zip(frame[KEY], text))
+
+
+class InvertedIndex:
+    def __init__(self):
+        self.postings = defaultdict(set)  # token -> refs
+        self.texts = {}                   # ref -> text it is indexed under
+        self._vocab = None                # sorted tokens, rebuilt after the token set changes
+
+    def put(self, ref, text):
+        old = self.texts.get(ref)
+        if old == text:
+            return
+        before, after = tokenize(old) if old is not None else set(), tokenize(text)
+        for token in before - after:
+            self.postings[token].discard(ref)
+            if not self.postings[token]:
+                del self.postings[token]
+                self._vocab = None
+        for token in after - before:
+            if token not in self.postings:
+                self._vocab = None
+            self.postings[token].add(ref)
+        self.texts[ref] = text
+
+    def extend(self, texts):
+        """``put`` for many refs the index has not seen yet."""
+        postings = self.postings
+        for ref, text in texts.items():
+            for token in tokenize(text):
+                postings[token].add(ref)
+        self.texts.update(texts)
+        self._vocab = None
+
+    def drop(self, ref):
+        if ref in self.texts:
+            self.put(ref, "")
+            del self.texts[ref]
+
+    def match(self, prefix):
+        """Refs having an indexed word that starts with ``prefix``."""
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        refs = set()
+        for i in range(bisect.bisect_left(self._vocab, prefix), len(self._vocab)):
+            if not self._vocab[i].startswith(prefix):
+                break
+            refs |= self.postings[self._vocab[i]]
+        return refs
+
+
+class SearchIndex(SnapshotFollower):
+    def __init__(self, store):
+        super().__init__(store, TAB)
+        self._live = InvertedIndex()
+        self._archived = InvertedIndex()
+        self._archive = []  # archive snapshots ``_archived`` was built from
+
+    def _load(self, frame):
+        texts = row_texts(frame)
+        if not self._live.texts:
+            self._live.extend(texts)
+            return
+        for ref in self._live.texts.keys() - texts.keys():
+            self._live.drop(ref)
+        for ref, text in texts.items():
+            self._live.put(ref, text)
+
+    def _apply(self, frame, change):
+        if change[0] == "update" and not set(change[2]) & set(FIELDS):
+            return
+        for ref, text in row_texts(frame.iloc[change[1]:change[1] + 1]).items():
+            self._live.put(ref, text)
+
+    def _sync_archive(self):
+        snaps = [self._store.snapshot(tab) for tab in self._store.archive_tabs()]
+        with self._lock:
+            if len(snaps) != len(self._archive) or any(a is not b for a, b in zip(snaps, self._archive)):
+                index = InvertedIndex()
+                for snap in snaps:
+                    index.extend(row_texts(snap.frame))
+                self._archived, self._archive = index, snaps
+
+    def search(self, query):
+        """REFERENCE_NOs matching every token of ``query``; None when it has no tokens."""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        self.ensure()
+        self._sync_archive()
+        with self._lock:
+            hits = None
+            for token in sorted(tokens, key=len, reverse=True):  # longest first: usually the rarest
+                refs = self._live.match(token) | self._archived.match(token)
+                hits = refs if hits is None else hits & refs
+                if not hits:
+                    break
+            return hits
+
+
+@st.cache_resource(show_spinner=False)
+def get_search():
+    return SearchIndex(get_store())
@@ -0,0 +1,163 @@
+"""Tab snapshots shared by every app process on this machine.
+
+Several Streamlit server processes run behind the load balancer. Each used
+to download and parse every tab for itself, so Sheets traffic and memory
+grew with the worker count. ``SheetStore`` now refreshes a tab in one
+process and shares the result:
+
+* ``lock(tab)`` takes an exclusive ``flock`` on ``<tab>.lock``. The process
+  that gets it is the tab's refresher for this round and reads Sheets. The
+  others keep serving the snapshot they have and adopt what it published on
+  their next read; only a process with none yet waits for it.
+* ``publish`` writes the snapshot as an Arrow IPC file, renamed into place,
+  and records it as the tab's next version in ``versions.sqlite3`` (WAL)
+  with the time it was fetched. When the refresh was a delta sync of the
+  previous version, the row also carries that delta, so a worker holding
+  the previous version patches a few rows instead of re-reading the file.
+* ``read`` memory-maps a version's file. Arrow-backed string columns stay
+  on the mapping, so the page cache holds one copy of the text for all
+  workers.
+
+Files of superseded versions are removed once ``KEEP_VERSIONS`` newer ones
+exist; a worker still holding one keeps its pages until it lets go.
+Without ``fcntl`` (Windows) ``available()`` is False and every process
+keeps refreshing on its own.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+KEEP_VERSIONS = 2    # files kept per tab, newest first
+LOCK_WAIT = 30       # seconds to wait for another process's refresh
+LOCK_POLL = 0.05
+
+# One row per tab: the newest published version. ``base`` is the version
+# ``changes`` apply to, or NULL when it was a full load.
+Version = namedtuple("Version", "version base fetched_at retry_at changes")
+
+
+def available():
+    return fcntl is not None
+
+
+class SharedSnapshots:
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self._dir = path
+        self._conn = sqlite3.connect(os.path.join(path, "versions.sqlite3"), timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS versions ("
+            " tab TEXT PRIMARY KEY, version INTEGER NOT NULL, base INTEGER,"
+            " fetched_at REAL NOT NULL, retry_at REAL NOT NULL DEFAULT 0, changes TEXT)"
+        )
+        self._lock = threading.Lock()
+
+    def _file(self, tab, version):
+        return os.path.join(self._dir, f"{tab}.{version}.arrow")
+
+    # --- READ ---
+    def latest(self, tab):
+        """The newest ``Version`` of ``tab``, or None before anything was published."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, base, fetched_at, retry_at, changes FROM versions WHERE tab = ?", (tab,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Version(*row[:4], None if row[4] is None else json.loads(row[4]))
+
+    def read(self, tab, version):
+        """Version ``version`` of ``tab`` as a DataFrame, memory-mapped read-only."""
+        with pa.memory_map(self._file(tab, version)) as source:
+            return ipc.open_file(source).read_all().to_pandas()
+
+    # --- PUBLISH ---
+    def publish(self, tab, frame, fetched_at, base=None, changes=None):
+        """Make ``frame`` the next version of ``tab``; returns its number.
+
+        ``changes`` (JSON-able) turn version ``base`` into ``frame``. They are
+        kept only if ``base`` is still the newest version.
+        """
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        tmp = os.path.join(self._dir, f".{tab}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with pa.OSFile(tmp, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT version FROM versions WHERE tab = ?", (tab,)).fetchone()
+                current = row[0] if row else 0
+                if base != current:
+                    base, changes = None, None
+                version = current + 1
+                os.replace(tmp, self._file(tab, version))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO versions (tab, version, base, fetched_at, retry_at, changes)"
+                    " VALUES (?, ?, ?, ?, 0, ?)",
+                    (tab, version, base, fetched_at, None if changes is None else json.dumps(changes)),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        old = self._file(tab, version - KEEP_VERSIONS)
+        if os.path.exists(old):
+            os.remove(old)
+        return version
+
+    def touch(self, tab, version, fetched_at):
+        """Record that ``version`` still matched the sheet at ``fetched_at``."""
+        with self._lock:
+            self._conn.execute("UPDATE versions SET fetched_at = max(fetched_at, ?), retry_at = 0"
+                               " WHERE tab = ? AND version = ?", (fetched_at, tab, version))
+
+    def defer(self, tab, until):
+        """A refresh failed: nobody retries before ``until``; they serve what they have."""
+        with self._lock:
+            self._conn.execute("UPDATE versions SET retry_at = ? WHERE tab = ?", (until, tab))
+
+    def expire(self, tab):
+        """Make the next reader of ``tab`` refresh it from Sheets."""
+        with self._lock:
+            self._conn.execute("UPDATE versions SET fetched_at = 0, retry_at = 0 WHERE tab = ?", (tab,))
+
+    # --- ELECTION ---
+    def lock(self, tab, wait=LOCK_WAIT):
+        """Hold ``tab``'s refresh lock across processes; yields False if not had within ``wait``."""
+        return file_lock(os.path.join(self._dir, f"{tab}.lock"), wait)
+
+
+@contextmanager
+def file_lock(path, wait=LOCK_WAIT, exclusive=True):
+    """``flock`` on ``path`` (shared unless ``exclusive``); yields False if not had within ``wait``."""
+    with open(path, "a") as handle:
+        deadline = time.monotonic() + wait
+        while True:
+            try:
+                fcntl.flock(handle, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(LOCK_POLL)
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
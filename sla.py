@@ -0,0 +1,128 @@
+"""SLA and ageing analytics over the live GRIEVANCE snapshot.
+
+The typed snapshot already holds DATE_TIME, ASSIGN_DATE and RESOLVE_DATE as
+datetime64 columns, so every figure here is a column subtraction and a
+groupby over the whole frame:
+
+* time to assign (filing to ASSIGN_DATE) and time to resolve (filing to
+  RESOLVE_DATE), as summary statistics and as bucketed distributions;
+* how long pending grievances have waited, grouped by officer and by type;
+* grievances currently in breach: NEW for longer than the assignment
+  threshold, or unresolved for longer than the resolution threshold.
+
+``SlaAnalytics`` follows the snapshot like the mirror and the summary. The
+durations are derived once per snapshot version, and a whole report is kept
+until the snapshot changes, the thresholds change or ``AGE_STEP`` seconds
+pass. Archived grievances are left out; they were all resolved long ago.
+"""
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytz
+import streamlit as st
+
+from db import SnapshotFollower, as_datetime, get_store
+
+TAB = "GRIEVANCE"
+ASSIGN_HOURS = float(os.environ.get("GMS_SLA_ASSIGN_HOURS", 48))  # NEW longer than this is a breach
+RESOLVE_DAYS = float(os.environ.get("GMS_SLA_RESOLVE_DAYS", 30))  # unresolved longer than this is a breach
+AGE_STEP = 300  # seconds a report's "now" may lag behind the clock
+
+HOUR_BUCKETS = ([0, 4, 24, 48, 72, 168, np.inf], ["< 4 h", "4-24 h", "1-2 d", "2-3 d", "3-7 d", "> 7 d"])
+DAY_BUCKETS = ([0, 1, 3, 7, 15, 30, 60, np.inf], ["< 1 d", "1-3 d", "3-7 d", "7-15 d", "15-30 d", "30-60 d", "> 60 d"])
+
+
+def durations(frame):
+    """One row per grievance: keys, status and the hours/days between its dates."""
+    if frame.empty or not {"DATE_TIME", "ASSIGN_DATE", "RESOLVE_DATE", "STATUS"} <= set(frame.columns):
+        return pd.DataFrame()
+    filed = as_datetime(frame["DATE_TIME"])
+    return pd.DataFrame({
+        "REFERENCE_NO": frame["REFERENCE_NO"],
+        "STATUS": frame["STATUS"],
+        "MARKED_OFFICER": frame["MARKED_OFFICER"],
+        "GRIEVANCE_TYPE": frame["GRIEVANCE_TYPE"],
+        "FILED": filed,
+        "ASSIGN_HOURS": (as_datetime(frame["ASSIGN_DATE"]) - filed) / pd.Timedelta(hours=1),
+        "RESOLVE_DAYS": (as_datetime(frame["RESOLVE_DATE"]) - filed) / pd.Timedelta(days=1),
+    })
+
+
+def distribution(values, buckets):
+    """``(stats, counts per bucket)`` for a Series of non-negative durations."""
+    values = values.dropna()
+    values = values[values >= 0]
+    stats = {"count": len(values)}
+    if len(values):
+        for name, value in (("mean", values.mean()), ("p50", values.quantile(0.5)), ("p90", values.quantile(0.9)),
+                            ("max", values.max())):
+            stats[name] = round(float(value), 1)
+    bins, labels = buckets
+    return stats, pd.cut(values, bins, labels=labels, right=False).value_counts(sort=False)
+
+
+def ageing(pending, by):
+    """Pending grievances per ``by`` value: how many, how long they have waited, how many are in breach."""
+    return (pending.groupby(by, observed=True, sort=False)
+            .agg(PENDING=("AGE_DAYS", "size"), AVG_AGE_DAYS=("AGE_DAYS", "mean"), MAX_AGE_DAYS=("AGE_DAYS", "max"),
+                 BREACHED=("BREACH", "count"))
+            .round(1).sort_values(["BREACHED", "MAX_AGE_DAYS"], ascending=False).reset_index())
+
+
+class SlaAnalytics(SnapshotFollower):
+    def __init__(self, store):
+        super().__init__(store, TAB)
+        self._frame = None
+        self._version = 0
+        self._durations = None  # ``durations(self._frame)``, derived on first read
+        self._report_key = None
+        self._report = None
+
+    def _load(self, frame):
+        self._frame, self._durations = frame, None
+        self._version += 1
+
+    def _apply(self, frame, change):
+        self._load(frame)
+
+    def report(self, assign_hours=ASSIGN_HOURS, resolve_days=RESOLVE_DAYS):
+        """Dict of ``assign``/``resolve`` distributions, ``by_officer``/``by_type`` ageing and ``breached`` rows."""
+        self.ensure()
+        with self._lock:
+            if self._durations is None:
+                self._durations = durations(self._frame if self._frame is not None else pd.DataFrame())
+            key = (self._version, assign_hours, resolve_days, int(time.time() // AGE_STEP))
+            if key != self._report_key:
+                self._report, self._report_key = self._build(self._durations, assign_hours, resolve_days), key
+            return self._report
+
+    @staticmethod
+    def _build(d, assign_hours, resolve_days):
+        if d.empty:
+            return None
+        now = pd.Timestamp(datetime.now(pytz.timezone("Asia/Kolkata")).replace(tzinfo=None))
+        pending = d[d["STATUS"] != "RESOLVED"]
+        age = (now - pending["FILED"]) / pd.Timedelta(days=1)
+        breach = pd.Series(pd.NA, index=pending.index, dtype="string")
+        breach = breach.mask(age > resolve_days, "Resolution")
+        breach = breach.mask((pending["STATUS"] == "NEW") & (age * 24 > assign_hours), "Assignment")
+        pending = pending.assign(AGE_DAYS=age.round(1), BREACH=breach)
+        breached = (pending[breach.notna()]
+                    .sort_values("AGE_DAYS", ascending=False)
+                    [["REFERENCE_NO", "STATUS", "MARKED_OFFICER", "GRIEVANCE_TYPE", "FILED", "AGE_DAYS", "BREACH"]])
+        return {
+            "assign": distribution(d["ASSIGN_HOURS"], HOUR_BUCKETS),
+            "resolve": distribution(d["RESOLVE_DAYS"], DAY_BUCKETS),
+            "by_officer": ageing(pending, "MARKED_OFFICER"),
+            "by_type": ageing(pending, "GRIEVANCE_TYPE"),
+            "breached": breached.reset_index(drop=True),
+            "as_of": now,
+        }
+
+
+@st.cache_resource(show_spinner=False)
+def get_sla():
+    return SlaAnalytics(get_store())
@@ -0,0 +1,125 @@
+"""Materialised grievance counts for the scorecards and officer workload.
+
+Counts by STATUS, by MARKED_OFFICER x STATUS, by GRIEVANCE_TYPE and by
+SECTION are built once per GRIEVANCE snapshot and then kept current by
+folding in each ``Snapshot.changes`` entry: +1 for an append, a move between
+buckets when a status transition changes STATUS/MARKED_OFFICER. A per-row
+``(STATUS, MARKED_OFFICER)`` list remembers which bucket each row is in.
+Reading a scorecard is a dict lookup, however large the table gets.
+
+Archived grievances (archive.py) are counted separately, once per archive
+snapshot, and added in: they are all RESOLVED, so they never move buckets.
+"""
+from collections import Counter
+
+import streamlit as st
+
+from db import SnapshotFollower, get_store
+
+TAB = "GRIEVANCE"
+PENDING = "UNDER PROCESS"
+
+
+def tally(frame):
+    """``(by_status, by_officer, by_type, by_section)`` counts over ``frame``."""
+    def counts(*columns):
+        if frame.empty or not set(columns) <= set(frame.columns):
+            return {}
+        return frame.groupby(list(columns), sort=False, observed=True).size().to_dict()
+
+    by_officer = {}
+    for (officer, status), n in counts("MARKED_OFFICER", "STATUS").items():
+        by_officer.setdefault(officer, Counter())[status] = n
+    return Counter(counts("STATUS")), by_officer, Counter(counts("GRIEVANCE_TYPE")), Counter(counts("SECTION"))
+
+
+class GrievanceSummary(SnapshotFollower):
+    def __init__(self, store):
+        super().__init__(store, TAB)
+        self._by_status = Counter()
+        self._by_officer = {}
+        self._by_type = Counter()
+        self._by_section = Counter()
+        self._rows = []
+        self._archive = []  # archive snapshots ``_archived`` was counted from
+        self._archived = (Counter(), {}, Counter(), Counter())
+
+    def _load(self, frame):
+        self._by_status, self._by_officer, self._by_type, self._by_section = tally(frame)
+        if {"STATUS", "MARKED_OFFICER"} <= set(frame.columns):
+            self._rows = list(zip(frame["STATUS"], frame["MARKED_OFFICER"]))
+        else:
+            self._rows = [(None, None)] * len(frame)
+
+    def _bump(self, status, officer, n):
+        self._by_status[status] += n
+        self._by_officer.setdefault(officer, Counter())[status] += n
+
+    def _apply(self, frame, change):
+        if change[0] == "append":
+            # ``frame`` may already hold later edits to this row; those edits'
+            # own entries then move it from and to the same bucket.
+            row = frame.iloc[change[1]]
+            state = (row.get("STATUS"), row.get("MARKED_OFFICER"))
+            self._rows.append(state)
+            self._bump(*state, 1)
+            self._by_type[row.get("GRIEVANCE_TYPE")] += 1
+            self._by_section[row.get("SECTION")] += 1
+            return
+        pos, after = change[1], change[2]
+        old = self._rows[pos]
+        new = (after.get("STATUS", old[0]), after.get("MARKED_OFFICER", old[1]))
+        if new != old:
+            self._bump(*old, -1)
+            self._bump(*new, 1)
+            self._rows[pos] = new
+
+    def _sync_archive(self):
+        snaps = [self._store.snapshot(tab) for tab in self._store.archive_tabs()]
+        with self._lock:
+            if len(snaps) != len(self._archive) or any(a is not b for a, b in zip(snaps, self._archive)):
+                by_status, by_officer, by_type, by_section = Counter(), {}, Counter(), Counter()
+                for snap in snaps:
+                    status, officer, g_type, section = tally(snap.frame)
+                    by_status.update(status)
+                    by_type.update(g_type)
+                    by_section.update(section)
+                    for name, counts in officer.items():
+                        by_officer.setdefault(name, Counter()).update(counts)
+                self._archived = (by_status, by_officer, by_type, by_section)
+                self._archive = snaps
+
+    # --- READS ---
+    def status_counts(self, officer=None):
+        """``{status: count}`` overall, or for one officer, archive included."""
+        self.ensure()
+        self._sync_archive()
+        with self._lock:
+            if officer is None:
+                counts = self._by_status + self._archived[0]
+            else:
+                counts = self._by_officer.get(officer, Counter()) + self._archived[1].get(officer, Counter())
+            return {status: n for status, n in counts.items() if n}
+
+    def officer_load(self, officers):
+        """``{officer: pending count}`` for the given officers, for assignment decisions."""
+        self.ensure()
+        with self._lock:
+            return {officer: self._by_officer.get(officer, Counter())[PENDING] for officer in officers}
+
+    def type_counts(self):
+        self.ensure()
+        self._sync_archive()
+        with self._lock:
+            return {k: n for k, n in (self._by_type + self._archived[2]).items() if n}
+
+    def section_counts(self):
+        self.ensure()
+        self._sync_archive()
+        with self._lock:
+            return {k: n for k, n in (self._by_section + self._archived[3]).items() if n}
+
+
+@st.cache_resource(show_spinner=False)
+def get_summary():
+    return GrievanceSummary(get_store())
@@ -0,0 +1,105 @@
+"""Fixtures running the store, write-behind queue and archiver against the
+in-process fake gspread backend (benchmarks/fake_gspread.py)."""
+import os
+import random
+import sys
+import tempfile
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+# db.py and quota.py read these at import time.
+os.environ["GMS_DATA_DIR"] = tempfile.mkdtemp(prefix="gms-test-")
+os.environ["GMS_SHARE_SNAPSHOTS"] = "0"
+os.environ["GMS_SHEETS_QUOTA"] = "60000"  # the fake has no quota to protect
+
+import archive  # noqa: E402
+import db  # noqa: E402
+import writer  # noqa: E402
+from fake_gspread import GRIEVANCE_HEADER, FakeBackend, dataset  # noqa: E402
+
+ROWS = 300
+COUNTED = ("STATUS", "MARKED_OFFICER", "GRIEVANCE_TYPE", "SECTION")
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    fake = FakeBackend(dataset(ROWS))
+    monkeypatch.setattr(db, "authorize", fake.authorize)
+    monkeypatch.setitem(db.TTL, "GRIEVANCE", 0)  # every snapshot() goes back to the sheet
+    return fake
+
+
+@pytest.fixture
+def grievances(backend):
+    """The fake GRIEVANCE rows, header first, as ``append_rows``/``batch_update`` leave them."""
+    return backend.spreadsheet.tabs["GRIEVANCE"].rows
+
+
+@pytest.fixture
+def make_store(backend):
+    return lambda shared=None: db.SheetStore({"type": "service_account"}, shared=shared)
+
+
+@pytest.fixture
+def make_writer(tmp_path, monkeypatch):
+    """``WriteBehind`` without its flushing thread; tests call ``flush()`` themselves."""
+    def make(store, journal="journal.sqlite3"):
+        with monkeypatch.context() as m:
+            m.setattr(threading.Thread, "start", lambda self: None)
+            return writer.WriteBehind(store, str(tmp_path / journal))
+    return make
+
+
+@pytest.fixture
+def churn(backend, grievances, make_writer):
+    """``run(store, seed, check)``: random traffic against GRIEVANCE, checked along the way.
+
+    Queued updates and appends, other workers' edits and appends straight
+    into the sheet, flushes, and one archive run halfway. Every few steps,
+    and once more after a final flush, the store's snapshot is refreshed (a
+    delta sync, or a reload after the archive) and ``check(rows)`` gets what
+    the store serves, archive tabs included, as ``{REFERENCE_NO: {column:
+    text}}`` for the ``COUNTED`` columns.
+    """
+    status, officer = GRIEVANCE_HEADER.index("STATUS"), GRIEVANCE_HEADER.index("MARKED_OFFICER")
+    officers = ["N/A", "Officer 1 (SSE)", "Officer 2 (AWM)", "Officer 3 (DYCME)"]
+
+    def served(store):
+        frame = store.snapshot("GRIEVANCE").frame
+        rows = {ref: dict(zip(COUNTED, values)) for ref, *values in
+                frame[["REFERENCE_NO", *COUNTED]].astype(str).itertuples(index=False)}
+        for tab in store.archive_tabs():
+            header, *body = backend.spreadsheet.tabs[tab].rows
+            rows.update((row[0], {c: row[header.index(c)] for c in COUNTED}) for row in body)
+        return rows
+
+    def run(store, seed, check, steps=60):
+        rng = random.Random(seed)
+        w = make_writer(store)
+        store.snapshot("GRIEVANCE")
+        for step in range(steps):
+            roll, row = rng.random(), rng.choice(grievances[1:])
+            fields = {"STATUS": rng.choice(("NEW", "UNDER PROCESS", "RESOLVED")), "MARKED_OFFICER": rng.choice(officers)}
+            if roll < 0.3:
+                w.update("GRIEVANCE", row[0], fields)
+            elif roll < 0.4:
+                w.update_many("GRIEVANCE", [(r[0], fields) for r in rng.sample(grievances[1:], 5)])
+            elif roll < 0.5:
+                w.append("GRIEVANCE", f"Q{seed}-{step}", [f"Q{seed}-{step}", *row[1:]])
+            elif roll < 0.65:
+                row[status], row[officer] = fields["STATUS"], fields["MARKED_OFFICER"]
+            elif roll < 0.75:
+                grievances.append([f"W{seed}-{step}", *row[1:]])
+            else:
+                w.flush()
+            if step == steps // 2:
+                assert sum(archive.archive(store, w, days=30).values()) > 0
+            if step % 5 == 4:
+                check(served(store))
+        while w.flush():
+            pass
+        check(served(store))
+    return run
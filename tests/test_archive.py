@@ -0,0 +1,27 @@
+"""Archiving deletes GRIEVANCE rows; writes by workers holding the old positions must still find theirs."""
+import archive
+import db
+from fake_gspread import GRIEVANCE_HEADER
+
+REMARK = GRIEVANCE_HEADER.index("OFFICER_REMARK")
+
+
+def test_update_queued_after_archive_lands_on_its_row(monkeypatch, grievances, make_store, make_writer):
+    monkeypatch.setitem(db.TTL, "GRIEVANCE", 3600)
+    archiver, worker = make_store(), make_store()
+    worker.snapshot("GRIEVANCE")  # positions from before the archive run, still fresh when it writes
+    moved = archive.archive(archiver, make_writer(archiver, "archiver.sqlite3"), days=30)
+    assert sum(moved.values()) > 0
+
+    refs = [grievances[-1][0], grievances[-5][0]]
+    before = {row[0]: list(row) for row in grievances}
+    w = make_writer(worker)
+    w.update("GRIEVANCE", refs[0], {"OFFICER_REMARK": "one"})
+    w.update_many("GRIEVANCE", [(refs[1], {"OFFICER_REMARK": "two"})])
+    while w.flush():
+        pass
+
+    after = {row[0]: row for row in grievances}
+    assert after[refs[0]][REMARK] == "one" and after[refs[1]][REMARK] == "two"
+    assert {ref for ref, row in after.items() if row != before[ref]} == set(refs)
+    assert w.pending() == [] and w.dead() == []
@@ -0,0 +1,59 @@
+"""CSV/XLSX exports, as st.download_button turns them into bytes."""
+import codecs
+import csv
+import io
+from collections import Counter
+
+import pytest
+from openpyxl import load_workbook
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+import db
+import mirror
+from export import PIVOTS, to_csv, to_xlsx
+from fake_gspread import GRIEVANCE_HEADER, FakeBackend, dataset
+
+ROWS = 5000  # three stream chunks of one DuckDB vector each
+
+
+@pytest.fixture
+def grievance_mirror(monkeypatch, make_store):
+    tabs = dataset(ROWS)
+    monkeypatch.setattr(db, "authorize", FakeBackend(tabs).authorize)
+    monkeypatch.setattr(mirror, "STREAM_VECTORS", 1)
+    m = mirror.GrievanceMirror(make_store())
+    assert len(list(m.stream())) == 3
+    return m, tabs["GRIEVANCE"]
+
+
+def as_bytes(data):
+    return convert_data_to_bytes_and_infer_mime(data, unsupported_error=TypeError(type(data)))[0]
+
+
+def test_csv_has_one_header_and_every_row_in_sheet_order(grievance_mirror):
+    m, rows = grievance_mirror
+    data = as_bytes(to_csv(m, {}))
+    assert data.startswith(codecs.BOM_UTF8)
+    table = list(csv.reader(io.StringIO(data.decode("utf-8-sig"))))
+    assert table[0] == GRIEVANCE_HEADER
+    assert [row[0] for row in table[1:]] == [row[0] for row in rows[1:]]
+
+    new = list(csv.reader(io.StringIO(as_bytes(to_csv(m, {"status": "NEW"})).decode("utf-8-sig"))))
+    assert len(new) - 1 == sum(row[10] == "NEW" for row in rows[1:])
+
+
+def test_xlsx_has_every_row_and_the_pivot_sheets(grievance_mirror):
+    m, rows = grievance_mirror
+    book = load_workbook(io.BytesIO(as_bytes(to_xlsx(m, {}))), read_only=True)
+    assert book.sheetnames == ["Grievances", "Summary", *PIVOTS]
+    table = list(book["Grievances"].values)
+    assert list(table[0]) == GRIEVANCE_HEADER
+    assert [row[0] for row in table[1:]] == [row[0] for row in rows[1:]]
+
+    summary = list(book["Summary"].values)
+    assert summary[1][summary[0].index("TOTAL")] == ROWS
+    for title, column in PIVOTS.items():
+        pivot = list(book[title].values)
+        header, body = pivot[0], pivot[1:]
+        expected = Counter(row[GRIEVANCE_HEADER.index(column)] for row in rows[1:])
+        assert {row[0]: row[header.index("TOTAL")] for row in body} == dict(expected)
@@ -0,0 +1,29 @@
+"""The DuckDB mirror stays equal to what the store serves as writes, syncs and archiving go by."""
+import threading
+from collections import Counter
+
+import pytest
+
+from conftest import COUNTED
+from mirror import GrievanceMirror
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_mirror_matches_a_full_recount(seed, monkeypatch, make_store, churn):
+    store = make_store()
+    with monkeypatch.context() as m:
+        m.setattr(threading.Thread, "start", lambda self: None)  # synced by hand below
+        mirror = GrievanceMirror(store)
+
+    def check(rows):
+        mirror.sync(fetch=False)
+        got = mirror.grievances(columns=["REFERENCE_NO", *COUNTED])
+        assert len(got) == len(rows)
+        assert got.set_index("REFERENCE_NO").astype(str).to_dict("index") == rows
+        statuses = Counter(row["STATUS"] for row in rows.values())
+        for status in ("NEW", "UNDER PROCESS", "RESOLVED"):
+            assert mirror.count(status=status) == statuses[status]
+        officer = "Officer 1 (SSE)"
+        assert mirror.count(officer=officer) == sum(row["MARKED_OFFICER"] == officer for row in rows.values())
+
+    churn(store, seed, check)
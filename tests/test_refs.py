@@ -0,0 +1,28 @@
+"""REFERENCE_NO allocation stays unique under concurrent submissions."""
+import threading
+
+from refs import RefAllocator
+
+
+def test_refs_unique_across_threads_and_connections(tmp_path):
+    path = str(tmp_path / "sequences.sqlite3")
+    allocators = [RefAllocator(path, lambda hrms_id, day: 0) for _ in range(2)]  # as two worker processes
+    refs = []
+
+    def submit(allocator):
+        for _ in range(50):
+            refs.append(allocator.next("E001", "20260101"))
+
+    threads = [threading.Thread(target=submit, args=(allocators[i % 2],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(refs) == [f"20260101E001{seq:03d}" for seq in range(1, 401)]
+
+
+def test_fresh_counter_continues_from_seed(tmp_path):
+    allocator = RefAllocator(str(tmp_path / "sequences.sqlite3"), lambda hrms_id, day: 7 if hrms_id == "E001" else 0)
+    assert allocator.next("E001", "20260101") == "20260101E001008"
+    assert allocator.next("E001", "20260101") == "20260101E001009"
+    assert allocator.next("E002", "20260101") == "20260101E002001"
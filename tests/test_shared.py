@@ -0,0 +1,51 @@
+"""Snapshots shared across processes: only what was read from Sheets is published, and
+readers that already hold a snapshot never wait for another process's refresh."""
+import os
+import time
+
+import pytest
+
+import db
+import shared
+
+pytestmark = pytest.mark.skipif(not shared.available(), reason="needs fcntl")
+
+
+def test_queued_writes_are_not_published(monkeypatch, tmp_path, grievances, make_store, make_writer):
+    monkeypatch.setitem(db.TTL, "GRIEVANCE", 0.2)  # a's refresh is fresh enough for b to adopt
+    a, b = (make_store(shared.SharedSnapshots(str(tmp_path / "snapshots"))) for _ in range(2))
+    w = make_writer(a)
+    a.snapshot("GRIEVANCE")
+    b.snapshot("GRIEVANCE")
+    ref = grievances[5][0]
+    w.update("GRIEVANCE", ref, {"OFFICER_REMARK": "queued"})
+    row = list(grievances[1])
+    row[0] = "QUEUED"
+    w.append("GRIEVANCE", "QUEUED", row)
+
+    time.sleep(0.3)
+    served = a.snapshot("GRIEVANCE").frame  # a refreshes and publishes
+    assert served.OFFICER_REMARK.iat[4] == "queued" and served.REFERENCE_NO.iat[-1] == "QUEUED"
+    adopted = b.snapshot("GRIEVANCE").frame
+    assert adopted.OFFICER_REMARK.iat[4] == grievances[5][13] != "queued"
+    assert "QUEUED" not in set(adopted.REFERENCE_NO)
+
+    while w.flush():
+        pass
+    time.sleep(0.3)
+    a.snapshot("GRIEVANCE")
+    adopted = b.snapshot("GRIEVANCE").frame
+    assert adopted.OFFICER_REMARK.iat[4] == "queued" and adopted.REFERENCE_NO.iat[-1] == "QUEUED"
+
+
+def test_reader_with_a_snapshot_does_not_wait_for_another_refresher(monkeypatch, tmp_path, make_store):
+    monkeypatch.setitem(db.TTL, "GRIEVANCE", 0.2)
+    directory = str(tmp_path / "snapshots")
+    store = make_store(shared.SharedSnapshots(directory))
+    snap = store.snapshot("GRIEVANCE")
+    time.sleep(0.3)
+    with shared.file_lock(os.path.join(directory, "GRIEVANCE.lock")) as held:  # another process refreshing
+        assert held
+        start = time.monotonic()
+        assert store.snapshot("GRIEVANCE") is snap
+        assert time.monotonic() - start < 1
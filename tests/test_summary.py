@@ -0,0 +1,30 @@
+"""Incrementally kept counts match a full recount as writes, syncs and archiving go by."""
+from collections import Counter
+
+import pytest
+
+from conftest import COUNTED
+from summary import GrievanceSummary
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_counts_match_a_full_recount(seed, make_store, churn):
+    store = make_store()
+    summary = GrievanceSummary(store)
+    officers = ["N/A", "Officer 1 (SSE)", "Officer 2 (AWM)"]
+
+    def check(rows):
+        summary.sync(fetch=False)
+        recount = {column: Counter(row[column] for row in rows.values()) for column in COUNTED}
+        assert summary.status_counts() == recount["STATUS"]
+        assert summary.type_counts() == recount["GRIEVANCE_TYPE"]
+        assert summary.section_counts() == recount["SECTION"]
+        for officer in officers:
+            assert summary.status_counts(officer) == Counter(
+                row["STATUS"] for row in rows.values() if row["MARKED_OFFICER"] == officer)
+        # Archived rows are all RESOLVED, so pending load over every row is the live tab's.
+        assert summary.officer_load(officers) == {officer: sum(
+            row["STATUS"] == "UNDER PROCESS" and row["MARKED_OFFICER"] == officer for row in rows.values())
+            for officer in officers}
+
+    churn(store, seed, check)
@@ -0,0 +1,84 @@
+"""Write-behind queue: the overlay across delta syncs, dead-lettering and lease expiry."""
+import sqlite3
+import time
+
+import writer
+from fake_gspread import GRIEVANCE_HEADER
+
+STATUS, REMARK = GRIEVANCE_HEADER.index("STATUS"), GRIEVANCE_HEADER.index("OFFICER_REMARK")
+
+
+def new_row(rows, ref):
+    row = list(rows[1])
+    row[0] = ref
+    return row
+
+
+def test_queued_update_survives_delta_sync(backend, grievances, make_store, make_writer):
+    store = make_store()
+    w = make_writer(store)
+    store.snapshot("GRIEVANCE")
+    ref = grievances[5][0]
+    w.update("GRIEVANCE", ref, {"STATUS": "NEW", "OFFICER_REMARK": "queued"})
+    grievances[9][STATUS] = "NEW"  # edited by someone else meanwhile
+
+    backend.reset_stats()
+    frame = store.snapshot("GRIEVANCE").frame
+    assert ("GRIEVANCE", "get_all_values") not in backend.calls  # a delta sync, not a reload
+    assert frame.loc[frame.REFERENCE_NO == ref, ["STATUS", "OFFICER_REMARK"]].values.tolist() == [["NEW", "queued"]]
+    assert frame.STATUS.iat[8] == "NEW"
+
+    while w.flush():
+        pass
+    assert grievances[5][STATUS] == "NEW" and grievances[5][REMARK] == "queued"
+    assert store.snapshot("GRIEVANCE").frame.OFFICER_REMARK.iat[4] == "queued"
+
+
+def test_queued_append_stays_after_rows_appended_elsewhere(grievances, make_store, make_writer):
+    store = make_store()
+    w = make_writer(store)
+    store.snapshot("GRIEVANCE")
+    w.append("GRIEVANCE", "MINE", new_row(grievances, "MINE"))
+    grievances.append(new_row(grievances, "OTHER"))
+
+    frame = store.snapshot("GRIEVANCE").frame
+    assert frame.REFERENCE_NO.iloc[-2:].tolist() == ["OTHER", "MINE"]
+    while w.flush():
+        pass
+    assert [row[0] for row in grievances[-2:]] == ["OTHER", "MINE"]
+    assert store.snapshot("GRIEVANCE").frame.REFERENCE_NO.iloc[-2:].tolist() == ["OTHER", "MINE"]
+
+
+def test_missing_row_is_dead_lettered_alone(monkeypatch, grievances, make_store, make_writer):
+    monkeypatch.setattr(writer, "BACKOFF_BASE", 0)  # retry at once
+    store = make_store()
+    w = make_writer(store)
+    w.update_many("GRIEVANCE", [("GONE", {"OFFICER_REMARK": "x"}), (grievances[3][0], {"OFFICER_REMARK": "kept"})])
+    while w.flush():
+        pass
+
+    assert grievances[3][REMARK] == "kept"
+    assert w.pending("GRIEVANCE") == []
+    [dead] = w.dead()
+    assert dead["ref_no"] == "GONE" and dead["attempts"] == writer.MAX_ATTEMPTS
+    assert "not found" in dead["error"]
+
+    w.requeue([dead["id"]])
+    assert w.pending("GRIEVANCE") == [("update", "GONE", {"OFFICER_REMARK": "x"})]
+
+
+def test_expired_lease_does_not_duplicate_append(monkeypatch, tmp_path, grievances, make_store, make_writer):
+    store = make_store()
+    a, b = make_writer(store), make_writer(store)  # two workers sharing one journal
+    a.append("GRIEVANCE", "ONCE", new_row(grievances, "ONCE"))
+    monkeypatch.setattr(a, "_finish", lambda *args, **kwargs: None)  # a dies after its append landed
+    a.flush()
+    assert [row[0] for row in grievances].count("ONCE") == 1
+    assert b.flush() is False  # still leased to a
+
+    with sqlite3.connect(tmp_path / "journal.sqlite3") as conn:
+        conn.execute("UPDATE journal SET lease_until = ?", (time.time() - 1,))
+    while b.flush():
+        pass
+    assert [row[0] for row in grievances].count("ONCE") == 1
+    assert b.pending() == []
@@ -0,0 +1,15 @@
+"""One module per page, imported the first time that page is shown.
+
+Each module has a ``render()`` that draws the page. Only the pages that
+read grievances import ``views.data`` (and with it pandas, gspread and
+DuckDB), so the landing page starts without them.
+"""
+import importlib
+
+PAGES = ('landing', 'new_form', 'status_check', 'login', 'admin_dashboard', 'role_selection', 'officer_dashboard',
+         'diagnostics', 'sla_analytics')
+
+
+def render(page):
+    if page in PAGES:
+        importlib.import_module(f"views.{page}").render()
@@ -0,0 +1,186 @@
+"""PAGE 5: ADMIN DASHBOARD"""
+import heapq
+
+import streamlit as st
+
+from export import to_csv, to_xlsx
+from search import get_search
+from views.common import SORT_ORDERS, get_ist_date_str, get_ist_time, go_to, paginate
+from views.data import get_counts, get_db, get_grievances
+from writer import get_writer
+
+BULK_LIMIT = 500  # NEW grievances offered for bulk assignment at a time
+
+
+def balance(refs, load):
+    """Assign each of ``refs`` to whichever officer in ``load`` ({officer: pending}) has least pending so far."""
+    heap = [(n, i, o) for i, (o, n) in enumerate(load.items())]
+    heapq.heapify(heap)
+    plan = {}
+    for ref in refs:
+        n, i, o = heapq.heappop(heap)
+        plan[ref] = o
+        heapq.heappush(heap, (n + 1, i, o))
+    return plan
+
+
+def render():
+    st.markdown('<div class="hindi-heading" style="font-size:35px;">Admin Dashboard</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="welcome-msg">Welcome: {st.session_state.active_super.get("NAME")}</div>', unsafe_allow_html=True)
+
+    db = get_db()
+    mirror = get_grievances()
+    summary = get_counts()
+
+    # Scorecards
+    counts = summary.status_counts()
+    count_total = sum(counts.values())
+    count_new = counts.get('NEW', 0)
+    count_process = counts.get('UNDER PROCESS', 0)
+    count_resolved = counts.get('RESOLVED', 0)
+
+    st.markdown(f"""
+    <div class="score-container">
+        <div class="score-card" style="background-color: #3498db; color: white;">
+            <div class="score-number">{count_new}</div><div class="score-label">NEW</div>
+        </div>
+        <div class="score-card" style="background-color: #f1c40f;">
+            <div class="score-number">{count_process}</div><div class="score-label">UNDER PROCESS</div>
+        </div>
+        <div class="score-card" style="background-color: #2ecc71; color: white;">
+            <div class="score-number">{count_resolved}</div><div class="score-label">RESOLVED</div>
+        </div>
+        <div class="score-card" style="background-color: white;">
+            <div class="score-number">{count_total}</div><div class="score-label">TOTAL</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Filter
+    st.write("### 🔽 Filter Data")
+    s1, s2, s3 = st.columns([3, 2, 2])
+    search_q = s1.text_input("🔍 Search", key="admin_q", placeholder="salary, quarter, वेतन ...")
+    type_choice = s2.selectbox("Grievance Type", ["ALL"] + sorted(summary.type_counts()), key="admin_type")
+    filed = s3.date_input("Filed Between", value=(), key="admin_dates", format="DD-MM-YYYY")
+    filter_choice = st.radio("View Status:", options=["ALL", "NEW", "UNDER PROCESS", "RESOLVED"], horizontal=True, key="admin_rad")
+    sort_choice = st.radio("Sort:", options=list(SORT_ORDERS), horizontal=True, key="admin_sort")
+
+    filters = {"status": None if filter_choice == 'ALL' else filter_choice}
+    if search_q.strip(): filters["refs"] = get_search().search(search_q)
+    if type_choice != "ALL": filters["g_type"] = type_choice
+    if len(filed) >= 1: filters["filed_from"] = filed[0]
+    if len(filed) == 2: filters["filed_to"] = filed[1]
+    if len(filters) == 1:
+        match_total = count_total if filter_choice == 'ALL' else counts.get(filter_choice, 0)
+    else:
+        match_total = mirror.count(**filters)
+        st.caption(f"{match_total} matching grievance(s)")
+    limit, offset = paginate(match_total, "admin")
+    f_df = mirror.grievances(order=SORT_ORDERS[sort_choice], limit=limit, offset=offset, **filters)
+
+    # Table
+    off_df = db.records("OFFICER_MAPPING")
+    officers = ["Select Officer"] + [f"{r['NAME']} ({r['RANK']})" for _, r in off_df[off_df['ROLE'].isin(['OFFICER', 'BOTH'])].iterrows()]
+    load = summary.officer_load(officers[1:])
+    officer_label = lambda o: o if o == "Select Officer" else f"{o} · {load[o]} pending"
+
+    with st.expander("👥 Officer Workload"):
+        st.dataframe([{"Officer": o, "Pending": load[o], "Resolved": summary.status_counts(o).get('RESOLVED', 0)}
+                      for o in sorted(load, key=load.get, reverse=True)], hide_index=True, width="stretch")
+
+    with st.expander("📦 Bulk Assign NEW Grievances"):
+        b1, b2 = st.columns(2)
+        bulk_type = b1.selectbox("Grievance Type", ["ALL"] + sorted(summary.type_counts()), key="bulk_type")
+        bulk_sec = b2.selectbox("Section", ["ALL"] + sorted(summary.section_counts()), key="bulk_sec")
+        pool = mirror.grievances(status="NEW", g_type=None if bulk_type == "ALL" else bulk_type,
+                                 section=None if bulk_sec == "ALL" else bulk_sec, limit=BULK_LIMIT,
+                                 columns=["REFERENCE_NO", "EMP_NAME", "SECTION", "GRIEVANCE_TYPE"])
+        if pool.empty: st.info("No NEW grievances match.")
+        else:
+            labels = {r['REFERENCE_NO']: f"{r['REFERENCE_NO']} · {r['GRIEVANCE_TYPE']} · {r['SECTION']} · {r['EMP_NAME']}"
+                      for _, r in pool.iterrows()}
+            # Keyed, so the selection survives reruns; only refs still in the pool stay selected.
+            st.session_state.bulk_refs = [r for r in st.session_state.get("bulk_refs", []) if r in labels]
+            st.checkbox(f"Select all {len(labels)} shown", key="bulk_all",
+                        on_change=lambda: st.session_state.update(bulk_refs=list(labels) if st.session_state.bulk_all else []))
+            chosen = st.multiselect("Grievances", list(labels), format_func=labels.get, key="bulk_refs")
+            mode = st.radio("Assign", ["To one officer", "Balance by pending load"], horizontal=True, key="bulk_mode")
+            if mode == "To one officer":
+                target = st.selectbox("Officer", officers, format_func=officer_label, key="bulk_officer")
+                team = [] if target == "Select Officer" else [target]
+            else:
+                team = st.multiselect("Officers", officers[1:], default=officers[1:], format_func=officer_label, key="bulk_team")
+            if st.button(f"✅ Assign {len(chosen)} Grievance(s)", key="bulk_go"):
+                if not chosen or not team: st.warning("⚠️ Select grievances and an officer.")
+                else:
+                    # Someone may have assigned some meanwhile: only queue those the sheet still has as NEW.
+                    snap = db.snapshot("GRIEVANCE").frame
+                    still_new = set(snap.loc[snap["STATUS"] == "NEW", "REFERENCE_NO"])
+                    skipped = [ref for ref in chosen if ref not in still_new]
+                    if skipped: st.warning(f"⚠️ {len(skipped)} grievance(s) are no longer NEW and were skipped.")
+                    plan = balance([ref for ref in chosen if ref in still_new], {o: load[o] for o in team})
+                    now_ist = get_ist_time()
+                    try:
+                        get_writer().update_many("GRIEVANCE", [
+                            (ref, {"STATUS": "UNDER PROCESS", "MARKED_OFFICER": o, "ASSIGN_DATE": now_ist})
+                            for ref, o in plan.items()])
+                    except Exception as e: st.error(f"Error: {e}")
+                    else:
+                        if plan: st.toast(f"{len(plan)} grievance(s) assigned to {len(set(plan.values()))} officer(s)!")
+                        if not skipped: st.rerun()
+
+    with st.expander("📥 Export"):
+        st.caption("Exports every grievance matching the search, type, date and status filters above.")
+        exp_officer = st.selectbox("Officer", ["ALL"] + officers[1:], key="exp_officer")
+        exp_filters = dict(filters, officer=None if exp_officer == "ALL" else exp_officer)
+        stamp = get_ist_date_str()
+        e1, e2 = st.columns(2)
+        e1.download_button("⬇️ CSV", lambda: to_csv(mirror, exp_filters), file_name=f"grievances_{stamp}.csv",
+                           mime="text/csv", key="exp_csv")
+        e2.download_button("⬇️ Excel (with summary)", lambda: to_xlsx(mirror, exp_filters),
+                           file_name=f"grievances_{stamp}.xlsx", key="exp_xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+    st.markdown("---")
+    if f_df.empty: st.info("No records found.")
+    else:
+        for i, row in f_df.iterrows():
+            with st.container():
+                c1, c2, c3 = st.columns([2, 4, 2])
+                color = "#3498db" if row['STATUS'] == "NEW" else "#f1c40f" if row['STATUS'] == "UNDER PROCESS" else "#2ecc71"
+                c1.markdown(f"**Ref:** `{row['REFERENCE_NO']}`")
+                c2.markdown(f"**Status:** <span style='color:{color}; font-weight:bold;'>{row['STATUS']}</span>", unsafe_allow_html=True)
+                c3.markdown(f"📅 {row['DATE_TIME']}")
+                
+                d1, d2, d3 = st.columns(3)
+                d1.markdown(f"Name: **{row['EMP_NAME']}**<br>HRMS: {row['HRMS_ID']}", unsafe_allow_html=True)
+                d2.markdown(f"Desig: {row['DESIGNATION']}<br>Section: {row['SECTION']}", unsafe_allow_html=True)
+                d3.markdown(f"Type: {row['GRIEVANCE_TYPE']}", unsafe_allow_html=True)
+                
+                st.info(f"**Description:** {row['GRIEVANCE_TEXT']}")
+
+                if row['STATUS'] == "NEW":
+                    sel = st.selectbox("Assign To:", officers, format_func=officer_label, key=f"adm_{row['REFERENCE_NO']}")
+                    if sel != "Select Officer":
+                        try:
+                            get_writer().update("GRIEVANCE", row['REFERENCE_NO'],
+                                                {"STATUS": "UNDER PROCESS", "MARKED_OFFICER": sel, "ASSIGN_DATE": get_ist_time()})
+                        except Exception: st.error("Grievance status changed, changes in status might take few seconds to reflect in dashboard")
+                        else:
+                            st.toast("Grievance Officer Successfully Assigned!")
+                            st.rerun()
+                else:
+                    assign_date = row.get('ASSIGN_DATE', row.get('OFFICER_REMARK', 'N/A')) 
+                    st.markdown(f"""
+                    <div style="background-color: #2c2e3a; padding: 10px; border-radius: 8px; border: 1px solid #444;">
+                        <span style="color: #fca311; font-weight: bold;">Assigned To:</span> <span style="color: white; font-weight: bold;">{row['MARKED_OFFICER']}</span>
+                        <span style="color: #fca311; font-weight: bold; margin-left: 15px;">Date:</span> <span style="color: white;">{assign_date}</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+                st.markdown("---")
+
+    if st.button("⏱️ SLA Analytics"): go_to('sla_analytics')
+    if st.button("📊 Diagnostics"): go_to('diagnostics')
+    if st.button("🚪 Logout"):
+        st.session_state.super_verified = False
+        go_to('landing')
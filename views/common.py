@@ -0,0 +1,47 @@
+"""Helpers shared by the pages. Kept free of pandas/gspread so light pages load fast."""
+import threading
+import time
+from datetime import datetime
+
+import pytz
+import streamlit as st
+
+from metrics import METRICS
+
+IST = pytz.timezone('Asia/Kolkata')
+PAGE_SIZES = [10, 25, 50, 100]
+SORT_ORDERS = {"Oldest pending first": "oldest_pending", "Newest first": "newest"}
+
+_run = threading.local()  # each session's script run has its own thread
+
+# --- TIMEZONE HELPER ---
+def get_ist_time():
+    return datetime.now(IST).strftime("%d-%m-%Y %H:%M")
+
+def get_ist_date_str():
+    return datetime.now(IST).strftime("%Y%m%d")
+
+# --- NAVIGATION ---
+def start_run():
+    _run.started = time.perf_counter()
+
+def record_render():
+    METRICS.observe("gms_page_render_seconds", time.perf_counter() - _run.started, page=st.session_state.page)
+
+def go_to(page):
+    record_render()
+    st.session_state.page = page
+    st.rerun()
+
+def is_admin():
+    return st.session_state.super_verified and st.session_state.active_super.get('ROLE', '').upper() in ['ADMIN', 'BOTH']
+
+def paginate(total, key):
+    """Page-size and page-number controls for a list of ``total`` items; returns (limit, offset)."""
+    p1, p2 = st.columns(2)
+    size = p1.selectbox("Per Page", PAGE_SIZES, index=1, key=f"{key}_size")
+    pages = max(1, -(-total // size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages: st.session_state[page_key] = pages
+    page = p2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+    return size, (page - 1) * size
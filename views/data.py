@@ -0,0 +1,26 @@
+"""Data access for the pages. Importing this loads pandas, gspread and DuckDB."""
+import streamlit as st
+
+from db import get_store
+from mirror import get_mirror
+from refs import get_allocator
+from summary import get_summary
+from views.common import get_ist_date_str
+
+# DATABASE CONNECT (one shared client/worksheet set per process, see db.py)
+def get_db():
+    if "gcp_service_account" not in st.secrets:
+        st.error("❌ Secrets not found!")
+        st.stop()
+    return get_store()
+
+def get_grievances():
+    get_db()
+    return get_mirror()
+
+def get_counts():
+    get_db()
+    return get_summary()
+
+def generate_ref_no(hrms_id):
+    return get_allocator().next(hrms_id, get_ist_date_str())
@@ -0,0 +1,78 @@
+"""PAGE 8: DIAGNOSTICS (admin only)"""
+import streamlit as st
+
+from archive import ARCHIVE_AFTER_DAYS, archive
+from db import DATE_FORMAT
+from metrics import METRICS
+from views.common import go_to, is_admin
+from views.data import get_db
+from writer import MAX_ATTEMPTS, get_writer
+
+
+def render():
+    if not is_admin(): go_to('login')
+    st.markdown('<div class="hindi-heading" style="font-size:35px;">Diagnostics</div>', unsafe_allow_html=True)
+    st.caption("Since this server process started; shared by all sessions.")
+
+    calls = METRICS.timings("gms_sheets_call_seconds")
+    errors = METRICS.counters("gms_sheets_errors_total")
+    retries = sum(v for _, v in METRICS.counters("gms_sheets_retries_total"))
+    cache = {}
+    for labels, v in METRICS.counters("gms_cache_requests_total"):
+        cache.setdefault(labels['tab'], dict.fromkeys(['hit', 'coalesced', 'shared', 'delta', 'miss', 'stale'], 0))[labels['result']] += v
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Sheets Calls", sum(r['count'] for r in calls))
+    c2.metric("429s", sum(v for labels, v in errors if labels['code'] == '429'))
+    c3.metric("Retries", retries)
+    c4.metric("Write Backlog", get_writer().backlog() if "gcp_service_account" in st.secrets else 0)
+
+    dead = get_writer().dead() if "gcp_service_account" in st.secrets else []
+    if dead:
+        st.markdown("#### Dead-lettered Writes")
+        st.caption(f"Given up after {MAX_ATTEMPTS} failed tries; these never reached the sheet.")
+        st.dataframe(dead, hide_index=True, width="stretch")
+        if st.button("🔁 Requeue All"):
+            get_writer().requeue([d['id'] for d in dead])
+            st.rerun()
+
+    st.markdown("#### Sheets API Latency")
+    st.dataframe(calls, hide_index=True, width="stretch")
+    if errors:
+        st.markdown("#### Sheets API Errors")
+        st.dataframe([{**labels, 'count': v} for labels, v in errors], hide_index=True, width="stretch")
+    st.markdown("#### Snapshot Cache")
+    st.dataframe([{'tab': tab, **c, 'hit_rate': f"{(sum(c.values()) - c['miss']) / max(1, sum(c.values())):.0%}"}
+                  for tab, c in sorted(cache.items())], hide_index=True, width="stretch")
+    unparsed = METRICS.counters("gms_unparsed_dates_total")
+    if unparsed:
+        st.markdown("#### Unparsed Dates")
+        st.caption(f"Date cells not in {DATE_FORMAT} format. They are shown as typed in the sheet but left out of "
+                   "SLA figures, date filters and archive ages.")
+        st.dataframe([{**labels, 'count': v} for labels, v in unparsed], hide_index=True, width="stretch")
+    st.markdown("#### Quota Waits")
+    st.dataframe(METRICS.timings("gms_quota_wait_seconds"), hide_index=True, width="stretch")
+    st.markdown("#### Page Renders")
+    st.dataframe(METRICS.timings("gms_page_render_seconds"), hide_index=True, width="stretch")
+
+    st.markdown("#### Archive")
+    st.caption("Moves RESOLVED grievances into per-year GRIEVANCE_ARCHIVE tabs. They stay visible in searches and counts.")
+    arch_days = st.number_input("Resolved more than (days) ago", min_value=30, value=ARCHIVE_AFTER_DAYS, step=30)
+    a1, a2 = st.columns(2)
+    if a1.button("🔎 Preview"):
+        try:
+            plan = archive(get_db(), get_writer(), days=arch_days, dry_run=True)
+            st.info(", ".join(f"{tab}: {n}" for tab, n in plan.items()) or "Nothing to archive.")
+        except Exception as e: st.error(f"Error: {e}")
+    if a2.button("🗄️ Archive Now"):
+        try:
+            moved = archive(get_db(), get_writer(), days=arch_days)
+            st.success(", ".join(f"{tab}: {n} moved" for tab, n in moved.items()) or "Nothing to archive.")
+        except Exception as e: st.error(f"Error: {e}")
+
+    text = METRICS.prometheus()
+    with st.expander("Prometheus Export"):
+        st.code(text, language="text")
+    st.download_button("⬇️ Download metrics.txt", text, file_name="metrics.txt", mime="text/plain")
+
+    if st.button("⬅️ Back to Dashboard"): go_to('admin_dashboard')
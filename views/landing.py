@@ -0,0 +1,19 @@
+"""PAGE 1: LANDING"""
+import os
+
+import streamlit as st
+
+from views.common import go_to
+
+LOGO_PATH = "assets/office_logo.png"
+LOGO_WIDTH = 225
+
+
+def render():
+    if os.path.exists(LOGO_PATH): st.image(LOGO_PATH, width=LOGO_WIDTH)
+    st.markdown('<div class="hindi-heading">सवारी डिब्बा कारखाना, आलमबाग, लखनऊ</div>', unsafe_allow_html=True)
+    st.markdown('<div class="english-heading">Grievance Management System</div>', unsafe_allow_html=True)
+    
+    if st.button("📝 नया Grievance दर्ज करें"): go_to('new_form')
+    if st.button("🔍 Grievance की वर्तमान स्थिति जानें"): go_to('status_check')
+    if st.button("🔐 Officer/ Admin Login"): go_to('login')
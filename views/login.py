@@ -0,0 +1,47 @@
+"""PAGE 4: LOGIN"""
+import streamlit as st
+
+from views.common import go_to
+from views.data import get_db
+
+
+def render():
+    st.markdown('<div class="hindi-heading">Dashboard Login</div>', unsafe_allow_html=True)
+    st.markdown('<div class="hindi-heading">Officer/ Admin</div>', unsafe_allow_html=True)
+    st.markdown('<div class="hindi-heading"></div>', unsafe_allow_html=True)
+    
+    locked = st.session_state.super_verified
+    s_hrms = st.text_input("Enter HRMS ID", value=st.session_state.active_super.get('HRMS_ID', ""), disabled=locked).upper().strip()
+    
+    if not st.session_state.super_verified:
+        if st.button("👤 Verify HRMS User"):
+            if not s_hrms:
+                st.warning("⚠️ Please enter correct HRMS ID.")
+            else:
+                with st.spinner("Fetching Details..."):
+                    try:
+                        officer = get_db().lookup("OFFICER_MAPPING", s_hrms)
+                    except Exception:
+                        officer = None
+                        st.error("Double CLick on Verify HRMS user")
+                    else:
+                        if officer is not None:
+                            st.session_state.active_super = officer
+                            st.session_state.super_verified = True
+                            st.rerun()
+                        else: st.error("❌ User not found.")
+                        
+    else:
+        st.success(f"✅ {st.session_state.active_super['NAME']}")
+        key = st.text_input("Password", type="password")
+        if st.button("🔓 Login"):
+            if str(key) == str(st.session_state.active_super['LOGIN_KEY']):
+                role = st.session_state.active_super['ROLE'].upper()
+                if role == "ADMIN": go_to('admin_dashboard')
+                elif role == "OFFICER": go_to('officer_dashboard')
+                elif role == "BOTH": go_to('role_selection')
+            else: st.error("Invalid Key")
+
+    if st.button("🏠 Back to Home"):
+        st.session_state.super_verified = False
+        go_to('landing')
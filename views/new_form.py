@@ -0,0 +1,64 @@
+"""PAGE 2: REGISTRATION"""
+import streamlit as st
+
+from views.common import get_ist_time, go_to
+from views.data import generate_ref_no, get_db
+from writer import get_writer
+
+
+def render():
+    st.markdown('<div class="hindi-heading">Grievance Registration\n</div>', unsafe_allow_html=True)
+    st.markdown('<div class="hindi-heading"></div>', unsafe_allow_html=True)
+    
+    if not st.session_state.hrms_verified:
+        hrms_in = st.text_input("Enter your HRMS ID (अपनी HRMS आईडी दर्ज करें)*", max_chars=6).upper().strip()
+        if st.button("🔎 Verify User"):
+            if not hrms_in: st.warning("⚠️ Enter HRMS ID.")
+            else:
+                try:
+                    emp = get_db().lookup("EMPLOYEE_MAPPING", hrms_in)
+                except Exception as e:
+                    emp = None
+                    st.error(f"Error: {e}")
+                else:
+                    if emp is not None:
+                        st.session_state.found_emp_name = emp['EMPLOYEE_NAME']
+                        st.session_state.hrms_verified = True
+                        st.session_state.active_hrms = hrms_in
+                        st.rerun()
+                    else: st.error("❌ HRMS ID not found.")
+    else:
+        st.success(f"✅ HRMS ID Verified: {st.session_state.found_emp_name}")
+        
+        try:
+            dd_df = get_db().records("DROPDOWN_MAPPINGS")
+            designations = ["Select"] + [x for x in dd_df['DESIGNATION_LIST'].unique().tolist() if x]
+            trades = ["Select"] + [x for x in dd_df['TRADE_LIST'].unique().tolist() if x]
+            g_types = ["Select"] + [x for x in dd_df['GRIEVANCE_TYPE_LIST'].unique().tolist() if x]
+        except: designations = trades = g_types = ["Select"]
+
+        emp_no = st.text_input("Employee Number (कर्मचारी संख्या)")
+        emp_desig = st.selectbox("Designation (पद)", designations)
+        emp_trade = st.selectbox("Trade (ट्रेड)", trades)
+        emp_sec = st.text_input("Section (कार्यस्थल)")
+        g_type = st.selectbox("Grievance Type (समस्या का प्रकार)", g_types)
+        g_text = st.text_area("Complaint Details (समस्या का विवरण)", max_chars=1000)
+
+        if st.button("📤 Grievance पंजीकृत करें"):
+            if not any(x in [None, "", "Select"] for x in [emp_no, emp_desig, emp_trade, emp_sec, g_type, g_text]):
+                try:
+                    get_db()
+                    ref_no = generate_ref_no(st.session_state.active_hrms)
+                    now_ist = get_ist_time()
+                    new_row = [ref_no, now_ist, st.session_state.active_hrms, st.session_state.found_emp_name, 
+                               emp_no, emp_sec, emp_desig, emp_trade, g_type, g_text, "NEW", "N/A", "N/A", "N/A", "N/A"]
+                    get_writer().append("GRIEVANCE", ref_no, new_row)
+                    st.success(f"✅ Grievance दर्ज करने के लिए धन्यवाद, शीघ्र ही इसका निस्तारण सुनिश्चित किया जायेगा। आपके Grievance का Reference संख्या है - {ref_no}")
+                    st.balloons()
+                    st.session_state.hrms_verified = False
+                except Exception as e: st.error(f"Error: {e}")
+            else: st.error("⚠️ सभी कॉलम भरना अनिवार्य है")
+
+    if st.button("🏠 Back to Home"):
+        st.session_state.hrms_verified = False
+        go_to('landing')
@@ -0,0 +1,89 @@
+"""PAGE 7: OFFICER DASHBOARD"""
+import streamlit as st
+
+from views.common import SORT_ORDERS, get_ist_time, go_to, paginate
+from views.data import get_counts, get_db, get_grievances
+from writer import get_writer
+
+
+def render():
+    st.markdown('<div class="hindi-heading" style="font-size:35px;">Officer Dashboard</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="welcome-msg">Welcome: {st.session_state.active_super.get("NAME")}</div>', unsafe_allow_html=True)
+
+    my_name_rank = f"{st.session_state.active_super['NAME']} ({st.session_state.active_super['RANK']})"
+    
+    get_db()
+    mirror = get_grievances()
+    my_counts = get_counts().status_counts(officer=my_name_rank)
+
+    cnt_total = sum(my_counts.values())
+    cnt_pending = my_counts.get('UNDER PROCESS', 0)
+    cnt_resolved = my_counts.get('RESOLVED', 0)
+
+    st.markdown(f"""
+    <div class="score-container">
+        <div class="score-card" style="background-color: white;">
+            <div class="score-number">{cnt_total}</div><div class="score-label">TOTAL</div>
+        </div>
+        <div class="score-card" style="background-color: #f1c40f;">
+            <div class="score-number">{cnt_pending}</div><div class="score-label">PENDING</div>
+        </div>
+        <div class="score-card" style="background-color: #2ecc71; color: white;">
+            <div class="score-number">{cnt_resolved}</div><div class="score-label">RESOLVED</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.write("### 🔽 Filter My Tasks")
+    off_filter = st.radio("Show:", ["ALL", "PENDING", "RESOLVED"], horizontal=True, key="off_rad")
+    off_sort = st.radio("Sort:", options=list(SORT_ORDERS), horizontal=True, key="off_sort")
+    
+    off_status = {"PENDING": "UNDER PROCESS", "RESOLVED": "RESOLVED"}.get(off_filter)
+    limit, offset = paginate(cnt_total if off_status is None else my_counts.get(off_status, 0), "officer")
+    view_df = mirror.grievances(officer=my_name_rank, status=off_status,
+                                order=SORT_ORDERS[off_sort], limit=limit, offset=offset)
+
+    st.markdown("---")
+    if view_df.empty: st.info("No tasks found.")
+    else:
+        for i, row in view_df.iterrows():
+            with st.container():
+                c1, c2, c3 = st.columns([2, 4, 2])
+                color = "#f1c40f" if row['STATUS'] == "UNDER PROCESS" else "#2ecc71"
+                c1.markdown(f"**Ref:** `{row['REFERENCE_NO']}`")
+                c2.markdown(f"**Status:** <span style='color:{color}; font-weight:bold;'>{row['STATUS']}</span>", unsafe_allow_html=True)
+                c3.markdown(f"📅 Assigned: {row.get('ASSIGN_DATE', 'N/A')}")
+
+                d1, d2, d3 = st.columns(3)
+                d1.markdown(f"Name: **{row['EMP_NAME']}**<br>HRMS: {row['HRMS_ID']}", unsafe_allow_html=True)
+                d2.markdown(f"Desig: {row['DESIGNATION']}<br>Section: {row['SECTION']}", unsafe_allow_html=True)
+                d3.markdown(f"Type: {row['GRIEVANCE_TYPE']}", unsafe_allow_html=True)
+                
+                st.info(f"**Issue:** {row['GRIEVANCE_TEXT']}")
+
+                if row['STATUS'] == "UNDER PROCESS":
+                    rem_key = f"rem_{row['REFERENCE_NO']}"
+                    remark = st.text_area("Resolution Remarks (Mandatory)*", key=rem_key)
+                    if st.button("✅ Mark as Resolved", key=f"btn_{row['REFERENCE_NO']}"):
+                        if not remark.strip():
+                            st.error("⚠️ Please enter resolution remarks.")
+                        else:
+                            try:
+                                get_writer().update("GRIEVANCE", row['REFERENCE_NO'],
+                                                    {"STATUS": "RESOLVED", "OFFICER_REMARK": remark, "RESOLVE_DATE": get_ist_time()})
+                            except Exception: st.error("Grievance status changed to resolved, changes in status might take few seconds to reflect in dashboard")
+                            else:
+                                st.toast("Resolved Successfully!")
+                                st.rerun()
+                else:
+                    st.markdown(f"""
+                    <div style="background-color: #2c2e3a; padding: 10px; border-radius: 8px;">
+                        <span style="color: #2ecc71; font-weight: bold;">Resolution:</span> {row.get('OFFICER_REMARK', 'N/A')}<br>
+                        <span style="color: #2ecc71; font-weight: bold;">Date:</span> {row.get('RESOLVE_DATE', 'N/A')}
+                    </div>
+                    """, unsafe_allow_html=True)
+                st.markdown("---")
+
+    if st.button("🚪 Logout"):
+        st.session_state.super_verified = False
+        go_to('landing')
@@ -0,0 +1,17 @@
+"""PAGE 6: ROLE SELECTION (For Users with 'BOTH' Role)"""
+import streamlit as st
+
+from views.common import go_to
+
+
+def render():
+    st.markdown('<div class="hindi-heading">Dashboard Selection</div>', unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True) # Spacer
+
+    if st.button("🛠️ Admin Dashboard"): go_to('admin_dashboard')
+    if st.button("📋 Officer Dashboard"): go_to('officer_dashboard')
+    
+    st.markdown("---")
+    if st.button("🚪 Logout"):
+        st.session_state.super_verified = False
+        go_to('landing')
@@ -0,0 +1,42 @@
+"""PAGE 9: SLA ANALYTICS (admin only)"""
+import streamlit as st
+
+from sla import ASSIGN_HOURS, RESOLVE_DAYS, get_sla
+from views.common import go_to, is_admin
+from views.data import get_db
+
+
+def render():
+    if not is_admin(): go_to('login')
+    st.markdown('<div class="hindi-heading" style="font-size:35px;">SLA Analytics</div>', unsafe_allow_html=True)
+    t1, t2 = st.columns(2)
+    assign_hours = t1.number_input("Assign within (hours)", min_value=1.0, value=ASSIGN_HOURS, step=12.0, key="sla_assign")
+    resolve_days = t2.number_input("Resolve within (days)", min_value=1.0, value=RESOLVE_DAYS, step=5.0, key="sla_resolve")
+    get_db()
+    report = get_sla().report(assign_hours, resolve_days)
+    if report is None: st.info("No grievances yet.")
+    else:
+        st.caption(f"Live grievances as of {report['as_of']:%d-%m-%Y %H:%M}; archived ones are not included.")
+        breached = report['breached']
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Median Time to Assign", f"{report['assign'][0].get('p50', 0)} h")
+        c2.metric("Median Time to Resolve", f"{report['resolve'][0].get('p50', 0)} d")
+        c3.metric("Assignment Breaches", int((breached['BREACH'] == "Assignment").sum()))
+        c4.metric("Resolution Breaches", int((breached['BREACH'] == "Resolution").sum()))
+
+        for title, key, unit in (("Time to Assign", 'assign', "hours"), ("Time to Resolve", 'resolve', "days")):
+            stats, buckets = report[key]
+            st.markdown(f"#### {title} ({unit})")
+            d1, d2 = st.columns([1, 2])
+            d1.dataframe([stats], hide_index=True, width="stretch")
+            d2.bar_chart(buckets.rename("grievances"), height=220)
+
+        st.markdown("#### Pending Ageing by Officer")
+        st.dataframe(report['by_officer'], hide_index=True, width="stretch")
+        st.markdown("#### Pending Ageing by Type")
+        st.dataframe(report['by_type'], hide_index=True, width="stretch")
+        st.markdown(f"#### Breached ({len(breached)})")
+        st.dataframe(breached, hide_index=True, width="stretch",
+                     column_config={"FILED": st.column_config.DatetimeColumn(format="DD-MM-YYYY HH:mm")})
+
+    if st.button("⬅️ Back to Dashboard"): go_to('admin_dashboard')
@@ -0,0 +1,80 @@
+"""PAGE 3: STATUS CHECK (COLOR CODED BACKGROUNDS)"""
+import textwrap
+
+import streamlit as st
+
+from views.common import go_to
+from views.data import get_grievances
+
+STATUS_CHECK_COLUMNS = ["REFERENCE_NO", "HRMS_ID", "GRIEVANCE_TEXT", "STATUS", "ASSIGN_DATE", "RESOLVE_DATE",
+                        "MARKED_OFFICER", "OFFICER_REMARK"]
+
+# --- CARD HTML (dedented once; rows only fill in the blanks) ---
+CARD = textwrap.dedent("""
+    <div class="g-card" style="background-color: {bg_color}; border-left-color: {border_color};">
+        <div class="g-ref">Ref No: {ref}</div>
+        <div class="g-label">Grievance Description</div>
+        <div class="g-value">{text}</div>
+        <div class="g-label">Action Taken</div>
+        <div class="badge-base {action_class}">{action_text}</div>
+    {extra_details}
+    </div>
+    """)
+ASSIGNED = textwrap.dedent("""
+    <div style="margin-top:10px;">
+        <span style="font-weight:900; color:#000;">Assigned On:</span> 
+        <span style="color:#000; font-weight:600;">{assign_date}</span>
+    </div>""")
+RESOLVED = textwrap.dedent("""
+    <div style="margin-top:10px;">
+        <div>
+            <span style="font-weight:900; color:#000;">Assigned On:</span> 
+            <span style="color:#000; font-weight:600;">{assign_date}</span>
+        </div>
+        <div>
+            <span style="font-weight:900; color:#000;">Resolved On:</span> 
+            <span style="color:#000; font-weight:600;">{resolve_date}</span>
+        </div>
+        <div class="remark-box">
+            <b style="color:#000;">Remark by: {officer}:</b><br>
+            "{remark}"
+        </div>
+    </div>""")
+# status -> (background, border, action text, badge class, extra details)
+CARD_STYLE = {
+    "NEW": ("#FFF", "#1565c0", "NEW, Assign Pending", "badge-new", ""),
+    "UNDER PROCESS": ("#FFF", "#fbc02d", "Assigned to Related Officer", "badge-process", ASSIGNED),
+    "RESOLVED": ("#FFF", "#2e7d32", "Resolved", "badge-resolved", RESOLVED),
+}
+
+
+def render():
+    st.markdown('<div class="hindi-heading">Grievance History</div>', unsafe_allow_html=True)
+    st.markdown('<div class="hindi-heading"></div>', unsafe_allow_html=True)
+    hrms_in = st.text_input("Enter Your HRMS ID (अपनी HRMS ID दर्ज करें)").upper().strip()
+    
+    if st.button("🔍 Find Grievances"):
+        if not hrms_in: 
+            st.warning("⚠️ Please enter HRMS ID.")
+        else:
+            try:
+                matches = get_grievances().grievances(hrms_id=hrms_in, order="newest", columns=STATUS_CHECK_COLUMNS)
+                
+                if not matches.empty:
+                    st.success(f"Found {len(matches)} Grievance(s)")
+                    
+                    for i, row in matches.iterrows():
+                        bg_color, border_color, action_text, action_class, extra = CARD_STYLE.get(
+                            row['STATUS'], ("#fff", "#ccc", "", "", ""))
+                        extra_details = extra.format(
+                            assign_date=row.get('ASSIGN_DATE', 'N/A'), resolve_date=row.get('RESOLVE_DATE', 'N/A'),
+                            officer=row.get('MARKED_OFFICER', 'N/A'), remark=row.get('OFFICER_REMARK', 'N/A'))
+                        card_html = CARD.format(bg_color=bg_color, border_color=border_color, ref=row['REFERENCE_NO'],
+                                                text=row['GRIEVANCE_TEXT'], action_class=action_class,
+                                                action_text=action_text, extra_details=extra_details)
+                        st.markdown(card_html, unsafe_allow_html=True)
+
+                else: st.error("❌ No grievances found for this HRMS ID.")
+            except Exception as e: st.error(f"Error fetching data: {e}")
+    
+    if st.button("🏠 Back to Home"): go_to('landing')
@@ -0,0 +1,115 @@
+"""App-wide CSS.
+
+Streamlit re-runs landing_page.py on every interaction, but imported
+modules stay loaded, so the stylesheet is formatted here once per process
+for each of the two layouts. A rerun only re-sends the finished string.
+"""
+APP_BG_COLOR = "#1d1a2b"
+WIDE_PAGES = ('admin_dashboard', 'officer_dashboard', 'diagnostics', 'sla_analytics')
+
+
+def _css(container_max_width):
+    return f"""
+<style>
+   
+    /* HIDE HEADER/FOOTER */
+    header, footer, [data-testid="stHeader"] {{ visibility: hidden; height: 0; }}
+    .stApp {{ background-color: {APP_BG_COLOR}; }}
+
+    /* 1. MAIN CONTAINER */
+    .block-container {{
+        max-width: {container_max_width} !important;
+        padding-top: 2rem !important;
+        margin: 0 auto !important;
+    }}
+
+    /* 2. LOGO */
+    [data-testid="stImage"] {{ display: flex; justify-content: center; width: 100%; margin-bottom: 0px; }}
+    [data-testid="stImage"] img {{ margin: 0 auto; }}
+
+    /* 3. HEADINGS */
+    .hindi-heading {{ text-align: center; color: white; font-weight: 900; font-size: 28px; width: 100%; }}
+    .english-heading {{ text-align: center; color: orange; font-weight: bold; font-size: 22px; margin-bottom: 30px; width: 100%; }}
+    .welcome-msg {{ text-align: center; color: #fca311; font-weight: 900; font-size: 24px; margin-bottom: 25px; width: 100%; }}
+
+    /* 4. INPUTS */
+    .stTextInput label, .stSelectbox label, .stTextArea label {{
+        color: white !important; font-weight: 700 !important; text-align: left !important; display: block !important; width: 100%;
+    }}
+    .stTextInput, .stSelectbox, .stTextArea {{ width: 100% !important; }}
+
+    /* 5. BUTTONS (330px Fixed) */
+    div.stButton > button {{
+        background-color: #faf9f9 !important;
+        color: #131419 !important;
+        border: 4px solid #fca311 !important;
+        border-radius: 20px !important;
+        width: 330px !important; 
+        height: 70px !important;
+        font-weight: 900 !important;
+        font-size: 20px !important;
+        margin: 10px auto !important; 
+        display: block !important;
+        box-shadow: 0 5px 15px rgba(0,0,0,0.3) !important;
+        transition: all 0.3s ease-in-out !important;
+    }}
+    div.stButton > button:hover {{
+        background-color: #a7c957 !important;
+        color: #fff !important;
+        border-color: #a7c957 !important;
+        transform: translateY(-4px) scale(1.04) !important;
+    }}
+    div.stButton > button p {{ 
+        font-weight: 900 !important; 
+        font-size: 17px !important;
+        margin: 0 !important; 
+    }}
+    
+    /* 6. SCORECARDS */
+    .score-container {{ display: flex; justify-content: center; gap: 15px; margin-bottom: 20px; flex-wrap: wrap; }}
+    .score-card {{
+        flex: 1; min-width: 150px; padding: 15px; border-radius: 12px; text-align: center;
+        color: #131419; font-weight: 900; box-shadow: 0 4px 8px rgba(0,0,0,0.3);
+    }}
+    .score-number {{ font-size: 28px; line-height: 1.2; }}
+    .score-label {{ font-size: 14px; text-transform: uppercase; letter-spacing: 1px; }}
+
+    /* 7. STATUS CARD STYLE (UPDATED) */
+    .g-card {{
+        border-radius: 15px;
+        padding: 20px;
+        margin-bottom: 20px;
+        box-shadow: 0 6px 15px rgba(0,0,0,0.3);
+        border-left: 10px solid #ccc; /* Will be overridden by inline style */
+        color: #131419;
+        font-family: sans-serif;
+    }}
+    .g-ref {{ font-size: 16px; font-weight: 900; color: #b4541a; margin-bottom: 10px; border-bottom: 2px solid rgba(0,0,0,0.1); padding-bottom: 8px; }}
+    .g-label {{ font-size: 16px; font-weight: bold; color: #34240c; text-transform: uppercase; margin-top: 12px; letter-spacing: 0.5px; }}
+    .g-value {{ font-size: 13px; color: #000; font-weight: 600; line-height: 1.4; }}
+    
+    /* Action Badges */
+    .badge-base {{ display: inline-block; padding: 8px 14px; border-radius: 20px; font-size: 15px; font-weight: 900; margin-top: 5px; border: 1px solid rgba(0,0,0,0.1); }}
+    .badge-new {{ background-color: #076db5; color: white; }}
+    .badge-process {{ background-color: #eca623; color: white; }}
+    .badge-resolved {{ background-color: #00a436; color: white; }}
+    
+    .remark-box {{
+        background-color: rgba(255,255,255,0.6);
+        border-left: 5px solid #2ecc71;
+        padding: 12px;
+        margin-top: 12px;
+        color: #000;
+        font-weight: 500;
+        border-radius: 0 5px 5px 0;
+    }}
+
+    /* Table Details */
+    .detail-label {{ color: #fca311; font-weight: bold; font-size: 14px; }}
+    .detail-val {{ color: white; font-weight: normal; font-size: 14px; margin-bottom: 5px; }}
+
+</style>
+"""
+
+
+CSS = {wide: _css("1200px" if wide else "480px") for wide in (False, True)}
@@ -0,0 +1,279 @@
+"""Write-behind queue for GRIEVANCE writes, backed by a durable local journal.
+
+Submitting or transitioning a grievance used to block the script thread on
+Google and lose the write if Sheets was slow or returning 429s. Now:
+
+1. the write is committed to a SQLite journal (WAL mode) under DATA_DIR;
+2. the cached snapshot is patched, so the user's change shows at once;
+3. the page acknowledges immediately;
+4. a worker thread flushes due entries: every due append in one
+   ``append_rows``, every due update in one ``batch_update``.
+
+Failed flushes back off exponentially per entry. Entries are leased while
+being flushed, so several worker processes sharing the journal never send
+the same entry twice at the same time. The lease is renewed for as long as
+the Sheets call runs, so it only runs out if its worker died or hung. A
+retried append, or one whose lease ran out, first checks the sheet's
+REFERENCE_NO column and skips rows that already landed. A timed-out
+request that actually succeeded is therefore not written twice.
+
+An update whose row the sheet doesn't have (deleted by hand, say) fails on
+its own, and the rest of its batch is still written. After
+``MAX_ATTEMPTS`` such failures it is dead-lettered: it stops being retried
+and leaves the overlay, and the Diagnostics page lists it so it can be
+requeued. Failures of a whole batch (Sheets down, quota) are retried
+indefinitely, because nothing is wrong with the entries themselves.
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import streamlit as st
+
+from db import DATA_DIR, INDEXED, get_store
+from metrics import METRICS
+from quota import WRITE, priority
+
+JOURNAL_DB = os.path.join(DATA_DIR, "journal.sqlite3")
+FLUSH_EVERY = 1.0    # seconds between flushes when idle
+BATCH_SIZE = 500     # entries per flush; a bulk assignment of up to this many goes out as one batch_update
+LEASE = 60           # seconds an entry stays claimed by a flushing worker, renewed while it sends
+BACKOFF_BASE = 2     # first retry delay; doubles per attempt ...
+BACKOFF_MAX = 300    # ... up to this
+KEEP_DONE = 7 * 86400  # flushed entries are kept this long for inspection
+MAX_ATTEMPTS = 8     # an entry failing on its own is dead-lettered after this many tries
+
+# journal.done: 0 pending, 1 written, DEAD given up on
+DEAD = 2
+
+
+class WriteBehind:
+    def __init__(self, store, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._store = store
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " tab TEXT NOT NULL, kind TEXT NOT NULL, ref_no TEXT NOT NULL, payload TEXT NOT NULL,"
+            " created REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_at REAL NOT NULL DEFAULT 0, lease_until REAL NOT NULL DEFAULT 0,"
+            " done INTEGER NOT NULL DEFAULT 0, error TEXT, owner TEXT)"
+        )
+        if "owner" not in {column[1] for column in self._conn.execute("PRAGMA table_info(journal)")}:
+            self._conn.execute("ALTER TABLE journal ADD COLUMN owner TEXT")  # journals from before leases had owners
+        self._conn.execute("CREATE INDEX IF NOT EXISTS journal_pending ON journal (done, next_at)")
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        for tab in INDEXED:
+            store.set_overlay(tab, lambda tab=tab: self.pending(tab))
+        threading.Thread(target=self._run, name="gms-write-behind", daemon=True).start()
+
+    # --- ENQUEUE ---
+    def _enqueue(self, tab, kind, entries):
+        """Journal ``[(ref_no, payload), ...]`` in one transaction, so they are flushed together."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO journal (tab, kind, ref_no, payload, created) VALUES (?, ?, ?, ?, ?)",
+                    [(tab, kind, str(ref_no), json.dumps(payload), now) for ref_no, payload in entries],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._wake.set()
+
+    def append(self, tab, ref_no, values):
+        """Queue a new row keyed ``ref_no``; it is durable once this returns."""
+        self._enqueue(tab, "append", [(ref_no, list(values))])
+        self._store.patch_append(tab, values)
+
+    def update(self, tab, ref_no, fields):
+        """Queue ``{column: value}`` for the row keyed ``ref_no``."""
+        self.update_many(tab, [(ref_no, fields)])
+
+    def update_many(self, tab, updates):
+        """Queue ``[(ref_no, {column: value}), ...]`` as one unit, e.g. a bulk assignment."""
+        self._enqueue(tab, "update", [(ref_no, dict(fields)) for ref_no, fields in updates])
+        self._store.patch_many(tab, updates)
+
+    def pending(self, tab=None):
+        """Not-yet-flushed entries, oldest first, as ``(kind, ref_no, payload)``."""
+        sql, params = "SELECT kind, ref_no, payload FROM journal WHERE done = 0", []
+        if tab is not None:
+            sql, params = sql + " AND tab = ?", [tab]
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id", params).fetchall()
+        return [(kind, ref_no, json.loads(payload)) for kind, ref_no, payload in rows]
+
+    def backlog(self):
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM journal WHERE done = 0").fetchone()[0]
+
+    def dead(self, limit=100):
+        """Dead-lettered entries, newest first, as dicts."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, tab, kind, ref_no, payload, created, attempts, error FROM journal"
+                " WHERE done = ? ORDER BY id DESC LIMIT ?", (DEAD, limit))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def requeue(self, ids):
+        """Put dead-lettered entries back in the queue with fresh attempts."""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE journal SET done = 0, attempts = 0, next_at = 0, lease_until = 0, error = NULL"
+                " WHERE id = ? AND done = ?", [(i, DEAD) for i in ids])
+        self._wake.set()
+
+    # --- FLUSH ---
+    def _run(self):
+        while True:
+            self._wake.wait(FLUSH_EVERY)
+            self._wake.clear()
+            try:
+                with priority(WRITE):
+                    while self.flush():
+                        pass
+                self.prune()
+                METRICS.gauge("gms_write_queue_backlog", self.backlog())
+                with self._lock:
+                    dead = self._conn.execute("SELECT count(*) FROM journal WHERE done = ?", (DEAD,)).fetchone()[0]
+                METRICS.gauge("gms_write_queue_dead", dead)
+            except Exception:
+                pass  # entries keep their backoff; try again next tick
+
+    def prune(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM journal WHERE done = 1 AND created < ?", (time.time() - KEEP_DONE,))
+
+    def _claim(self, owner):
+        """Lease a batch of due entries to ``owner``; updates wait for their row's append.
+
+        Rows are ``(id, tab, kind, ref_no, payload, attempts, lease_until)``;
+        a non-zero ``lease_until`` means an earlier lease ran out mid-send.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, tab, kind, ref_no, payload, attempts, lease_until FROM journal j"
+                    " WHERE done = 0 AND next_at <= ? AND lease_until <= ?"
+                    " AND NOT (kind = 'update' AND EXISTS ("
+                    "   SELECT 1 FROM journal a WHERE a.done = 0 AND a.kind = 'append'"
+                    "   AND a.ref_no = j.ref_no AND a.id < j.id))"
+                    " ORDER BY id LIMIT ?",
+                    (now, now, BATCH_SIZE),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE journal SET lease_until = ?, owner = ? WHERE id = ?",
+                    [(now + LEASE, owner, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    @contextmanager
+    def _renewing(self, owner):
+        """Keep ``owner``'s leases alive while the body runs, however long Sheets takes."""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(LEASE / 3):
+                with self._lock:
+                    self._conn.execute("UPDATE journal SET lease_until = ? WHERE owner = ? AND done = 0",
+                                       (time.time() + LEASE, owner))
+
+        thread = threading.Thread(target=renew, name="gms-write-lease", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _finish(self, entries, owner, error=None, own=False):
+        """Mark ``entries`` written, or failed with ``error`` and backed off.
+
+        ``own`` failures were the entries' own fault; those are dead-lettered
+        after ``MAX_ATTEMPTS``. Entries whose lease passed to another worker
+        are left to it.
+        """
+        with self._lock:
+            if error is None:
+                self._conn.executemany("UPDATE journal SET done = 1, error = NULL, lease_until = 0"
+                                       " WHERE id = ? AND owner = ?", [(e[0], owner) for e in entries])
+                return
+            now, failed = time.time(), []
+            for e in entries:
+                attempts = e[5] + 1
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** e[5]) * random.uniform(0.8, 1.2)
+                failed.append((attempts, now + delay, DEAD if own and attempts >= MAX_ATTEMPTS else 0, error,
+                               e[0], owner))
+            self._conn.executemany(
+                "UPDATE journal SET attempts = ?, next_at = ?, done = ?, lease_until = 0, owner = NULL, error = ?"
+                " WHERE id = ? AND owner = ?", failed)
+
+    def flush(self):
+        """Send one batch; returns False once nothing was due."""
+        owner = uuid.uuid4().hex
+        rows = self._claim(owner)
+        if not rows:
+            return False
+        by_tab = {}
+        for row in rows:
+            by_tab.setdefault(row[1], []).append(row)
+        with self._renewing(owner):
+            self._send(by_tab, owner)
+        return True  # updates held back for an append in this batch are due now
+
+    def _send(self, by_tab, owner):
+        for tab, entries in by_tab.items():
+            appends = [e for e in entries if e[2] == "append"]
+            updates = [e for e in entries if e[2] == "update"]
+            for batch, send in ((appends, self._send_appends), (updates, self._send_updates)):
+                if not batch:
+                    continue
+                try:
+                    missing = set(send(tab, batch) or ())
+                except Exception as err:
+                    self._finish(batch, owner, error=repr(err))
+                    METRICS.inc("gms_write_queue_failed_total", len(batch), tab=tab)
+                    continue
+                failed = [e for e in batch if e[3] in missing]
+                if failed:
+                    self._finish(failed, owner, error=f"{INDEXED[tab]} not found in {tab}", own=True)
+                    METRICS.inc("gms_write_queue_failed_total", len(failed), tab=tab)
+                self._finish([e for e in batch if e[3] not in missing], owner)
+                METRICS.inc("gms_write_queue_flushed_total", len(batch) - len(failed), tab=tab)
+
+    def _send_appends(self, tab, entries):
+        if any(e[5] or e[6] for e in entries):
+            # A previous attempt may have landed before it failed or its worker died: skip those rows.
+            header = self._store.call(tab, "row_values", 1)
+            present = set(self._store.call(tab, "col_values", header.index(INDEXED[tab]) + 1))
+            entries = [e for e in entries if e[3] not in present]
+        if entries:
+            self._store.write_rows(tab, [json.loads(e[4]) for e in entries])
+
+    def _send_updates(self, tab, entries):
+        """Write ``entries``; returns the keys whose row the sheet doesn't have."""
+        return self._store.write_fields(tab, [(e[3], json.loads(e[4])) for e in entries])
+
+
+@st.cache_resource(show_spinner=False)
+def get_writer():
+    return WriteBehind(get_store(), JOURNAL_DB)